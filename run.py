@@ -106,10 +106,15 @@ def setup_logging():
 class SignalHandler:
     """Handle system signals and graceful shutdown."""
     
-    # Platform-specific signal mappings
-    @staticmethod
-    def _get_platform_signals():
-        """Get platform-specific signal mappings."""
+    # Signals to handle on this platform, computed on first setup()
+    _ACTIVE_SIGNALS: Optional[List[int]] = None
+    
+    @classmethod
+    def _active_signals(cls) -> List[int]:
+        """Get the validated signals to handle on the current platform."""
+        if cls._ACTIVE_SIGNALS is not None:
+            return cls._ACTIVE_SIGNALS
+        
         def is_valid_signal(sig):
             """Check if a signal is valid on the current platform."""
             try:
@@ -119,41 +124,22 @@ class SignalHandler:
             except (ValueError, OSError, AttributeError):
                 return False
 
-        base_signals = {
-            'terminate': [],
-            'interrupt': [],
-            'reload': []
-        }
-        
         # Always try to add SIGTERM and SIGINT if available
-        if is_valid_signal(signal.SIGTERM):
-            base_signals['terminate'].append(signal.SIGTERM)
-        if is_valid_signal(signal.SIGINT):
-            base_signals['interrupt'].append(signal.SIGINT)
+        candidates = [signal.SIGTERM, signal.SIGINT]
         
-        if Platform.detect() == Platform.WINDOWS:
+        if CURRENT_PLATFORM == Platform.WINDOWS:
             # Windows-specific signals
-            for sig in [signal.SIGBREAK, signal.CTRL_C_EVENT, signal.CTRL_BREAK_EVENT]:
-                if is_valid_signal(sig):
-                    base_signals['terminate'].append(sig)
-        else:
+            candidates.extend(
+                getattr(signal, name)
+                for name in ('SIGBREAK', 'CTRL_C_EVENT', 'CTRL_BREAK_EVENT')
+                if hasattr(signal, name)
+            )
+        elif hasattr(signal, 'SIGHUP'):
             # Unix-like systems (Linux, macOS)
-            try:
-                if hasattr(signal, 'SIGHUP') and is_valid_signal(signal.SIGHUP):
-                    base_signals['reload'].append(signal.SIGHUP)
-            except AttributeError:
-                pass  # SIGHUP not available
-                
-        # Use the same validated signals for all platforms
-        return {
-            Platform.WINDOWS: base_signals,
-            Platform.LINUX: base_signals,
-            Platform.MACOS: base_signals,
-            Platform.UNKNOWN: base_signals
-        }
-    
-    # Initialize signals based on current platform
-    SIGNALS = _get_platform_signals()
+            candidates.append(signal.SIGHUP)
+        
+        cls._ACTIVE_SIGNALS = [sig for sig in candidates if is_valid_signal(sig)]
+        return cls._ACTIVE_SIGNALS
     
     def __init__(self):
         self._shutdown_event = asyncio.Event()
@@ -242,12 +228,7 @@ class SignalHandler:
         self._setup_platform_specific()
         
         # Get signals for current platform
-        platform_signals = self.SIGNALS.get(self._platform, self.SIGNALS[Platform.UNKNOWN])
-        active_signals = []
-        
-        # Collect all signals for the platform
-        for signal_type, sigs in platform_signals.items():
-            active_signals.extend(sigs)
+        active_signals = self._active_signals()
         
         # Set up handlers for all collected signals
         for sig in active_signals:
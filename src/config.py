@@ -5,16 +5,67 @@ Following PEP 257 for docstring conventions.
 """
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache, lru_cache
+from operator import itemgetter
 from typing import Dict
 from pathlib import Path
 from .server_config import ServerConfig
 from .credential_manager import CredentialManager
+from . import json_utils
+
+# Required per-server fields, pulled out of each server entry in one call
+_SERVER_FIELDS = itemgetter(
+    "map_name", "rcon_host", "rcon_port", "rcon_password",
+    "max_wild_dino_level", "tribe_name", "player_names", "is_pve"
+)
+
+# Keys that must be present in each config section; everything else has a default
+_REQUIRED_KEYS = (
+    ("discord", ("token", "channel_id_global", "channel_id_server_status", "channel_id_ai")),
+    ("ai", ("ollama_url", "ollama_model", "ollama_start_cmd", "timeout_seconds")),
+    ("database", ("path",)),
+)
+
+def _missing_config_keys(config: dict) -> list:
+    """List required configuration keys that are absent.
+    
+    Args:
+        config: Parsed configuration
+    
+    Returns:
+        Dotted names of the missing keys, e.g. "ai.ollama_url"
+    """
+    missing = []
+    for section_name, keys in _REQUIRED_KEYS:
+        section = config.get(section_name)
+        if not isinstance(section, dict):
+            missing.extend(f"{section_name}.{key}" for key in keys)
+        else:
+            missing.extend(f"{section_name}.{key}" for key in keys if key not in section)
+    return missing
+
+@lru_cache(maxsize=None)
+def _server_slug(server_name: str) -> str:
+    """Turn a server name into the identifier used for its summary table.
+    
+    Uses full Unicode lowercasing so existing table names stay the same;
+    results are cached because the same names are seen on every reload.
+    
+    Args:
+        server_name: Display name of the server
+    
+    Returns:
+        Lowercase name with spaces replaced by underscores
+    """
+    return server_name.lower().replace(' ', '_')
 
 class Config:
     """Configuration class following singleton pattern for application settings."""
     
     _instance = None
     _config_file = "config.json"
+    _config_path = None  # Resolved on first load and reused by reload()
     
     def __new__(cls):
         """Ensure only one instance of Config exists."""
@@ -34,81 +85,131 @@ class Config:
     def reset(cls):
         """Clear the singleton instance (useful for testing)."""
         cls._instance = None
+        cls._config_path = None
+        get_config.cache_clear()
+    
+    @classmethod
+    def _resolve_config_path(cls) -> Path:
+        """Locate the config file once and cache the result.
+        
+        Returns:
+            Path of the first existing config file candidate
+        
+        Raises:
+            FileNotFoundError: If no candidate exists
+        """
+        if cls._config_path is None:
+            # Try current directory first, then parent directory
+            config_paths = [
+                Path(cls._config_file),
+                Path("..") / cls._config_file,
+                Path(__file__).parent.parent / cls._config_file
+            ]
+            for config_path in config_paths:
+                if config_path.exists():
+                    cls._config_path = config_path.resolve()
+                    break
+            else:
+                raise FileNotFoundError(f"Config file not found in any of: {config_paths}")
+        return cls._config_path
+    
+    @staticmethod
+    def _get_keyring_rcon_password(server_name: str):
+        """Look up a server's RCON password, treating keyring errors as a miss.
+        
+        Args:
+            server_name: Name of the server
+        
+        Returns:
+            The RCON password, or None if it could not be retrieved
+        """
+        try:
+            return CredentialManager.get_rcon_password(server_name)
+        except Exception as e:
+            logging.warning("Keyring lookup failed for server '%s': %s", server_name, e)
+            return None
     
     def _load_servers(self, servers_data: list) -> Dict[str, ServerConfig]:
         """Load server configurations from config data."""
         try:
             servers = {}
-            logging.info(f"Loading {len(servers_data)} servers from config")
+            logging.info("Loading %d servers from config", len(servers_data))
+            
+            # Keyring lookups are blocking IPC calls, so fetch them all up front in parallel
+            keyring_names = [
+                server_data["name"] for server_data in servers_data
+                if server_data.get("rcon_password") == "STORED_IN_KEYRING"
+            ]
+            keyring_passwords = {}
+            if keyring_names:
+                logging.info("Retrieving RCON passwords for %d servers from keyring", len(keyring_names))
+                with ThreadPoolExecutor(max_workers=min(8, len(keyring_names))) as executor:
+                    keyring_passwords = dict(zip(
+                        keyring_names,
+                        executor.map(self._get_keyring_rcon_password, keyring_names)
+                    ))
+            
             for server_data in servers_data:
                 server_name = server_data["name"]
-                logging.info(f"Loading server: {server_name}")
+                logging.info("Loading server: %s", server_name)
                 
                 try:
+                    (map_name, rcon_host, rcon_port, rcon_password, max_wild_dino_level,
+                     tribe_name, player_names, is_pve) = _SERVER_FIELDS(server_data)
+                    
                     # Get RCON password from keyring if it's a placeholder
-                    rcon_password = server_data["rcon_password"]
                     if rcon_password == "STORED_IN_KEYRING":
-                        logging.info(f"Retrieving RCON password for {server_name} from keyring")
-                        rcon_password = CredentialManager.get_rcon_password(server_name)
+                        rcon_password = keyring_passwords.get(server_name)
                         if not rcon_password:
-                            logging.warning(f"RCON password for server '{server_name}' not found in keyring. Skipping server.")
+                            logging.warning("RCON password for server '%s' not found in keyring. Skipping server.", server_name)
                             continue
                         else:
-                            logging.info(f"RCON password found for {server_name}")
+                            logging.info("RCON password found for %s", server_name)
                     
                     servers[server_name] = ServerConfig(
                         name=server_name,
-                        map_name=server_data["map_name"],
-                        rcon_host=server_data["rcon_host"],
-                        rcon_port=int(server_data["rcon_port"]),
+                        map_name=map_name,
+                        rcon_host=rcon_host,
+                        rcon_port=int(rcon_port),
                         rcon_password=rcon_password,
-                        max_wild_dino_level=int(server_data["max_wild_dino_level"]),
-                        tribe_name=server_data["tribe_name"],
-                        player_names=server_data["player_names"],
-                        is_pve=bool(server_data["is_pve"]),
-                        database_table=f"summaries_{server_data['name'].lower().replace(' ', '_')}",
+                        max_wild_dino_level=int(max_wild_dino_level),
+                        tribe_name=tribe_name,
+                        player_names=player_names,
+                        is_pve=bool(is_pve),
+                        database_table=f"summaries_{_server_slug(server_name)}",
                         log_file_path=server_data.get("log_file_path", None)
                     )
-                    logging.info(f"Successfully loaded server: {server_name}")
+                    logging.info("Successfully loaded server: %s", server_name)
                     
                 except Exception as e:
-                    logging.warning(f"Failed to load server '{server_name}': {e}. Skipping.")
+                    logging.warning("Failed to load server '%s': %s. Skipping.", server_name, e)
                     continue
             
-            logging.info(f"Successfully loaded {len(servers)} out of {len(servers_data)} servers")
+            logging.info("Successfully loaded %d out of %d servers", len(servers), len(servers_data))
             return servers
         except KeyError as e:
             error_msg = f"Missing required server configuration field: {e}"
             logging.error(error_msg)
             raise RuntimeError(error_msg)
         except Exception as e:
-            logging.error(f"Error loading servers: {e}")
+            logging.error("Error loading servers: %s", e)
             raise
     
     def _load_config(self):
         """Load configuration from JSON file."""
         try:
-            # Try current directory first, then parent directory
-            config_paths = [
-                self._config_file,
-                Path("..") / self._config_file,
-                Path(__file__).parent.parent / self._config_file
-            ]
+            config_file_used = self._resolve_config_path()
             
-            config_file_used = None
-            for config_path in config_paths:
-                if Path(config_path).exists():
-                    config_file_used = config_path
-                    break
-            
-            if config_file_used is None:
-                raise FileNotFoundError(f"Config file not found in any of: {config_paths}")
+            with open(config_file_used, 'rb') as f:
+                raw_config = f.read()
+            config = json_utils.loads(raw_config)
             
-            with open(config_file_used, 'r') as f:
-                config = json.load(f)
+            missing_keys = _missing_config_keys(config)
+            if missing_keys:
+                raise RuntimeError(f"Missing required configuration values: {', '.join(missing_keys)}")
             
-            logging.info(f"Successfully loaded config from: {config_file_used}")
-            logging.debug(f"Config clusters section: {config.get('clusters', {})}")
+            logging.info("Successfully loaded config from: %s", config_file_used)
+            logging.debug("Config clusters section: %s", config.get('clusters', {}))
             
             # Store the path for future writes
             self._config_file = str(config_file_used)
@@ -153,24 +254,24 @@ class Config:
             try:
                 self.servers = self._load_servers(servers_data)
             except Exception as e:
-                logging.warning(f"Error loading servers, continuing with empty server list: {e}")
+                logging.warning("Error loading servers, continuing with empty server list: %s", e)
                 self.servers = {}
             
             # Cluster Configurations
             clusters_data = config.get("clusters", {})
-            logging.debug(f"Loaded clusters data: {clusters_data}")
+            logging.debug("Loaded clusters data: %s", clusters_data)
             self.clusters = {}
+            loaded_servers = self.servers.keys()
             for cluster_name, cluster_info in clusters_data.items():
                 try:
-                    logging.debug(f"Processing cluster '{cluster_name}': {cluster_info}")
+                    logging.debug("Processing cluster '%s': %s", cluster_name, cluster_info)
                     # Verify all servers in cluster exist
-                    valid_servers = []
-                    for server_name in cluster_info.get("servers", []):
-                        logging.debug(f"Checking server '{server_name}' for cluster '{cluster_name}'")
-                        if server_name in self.servers:
-                            valid_servers.append(server_name)
-                        else:
-                            logging.warning(f"Cluster '{cluster_name}' references non-existent server '{server_name}'. Skipping server.")
+                    requested_servers = cluster_info.get("servers", ())
+                    valid_servers = [name for name in requested_servers if name in loaded_servers]
+                    if len(valid_servers) != len(requested_servers):
+                        for server_name in requested_servers:
+                            if server_name not in loaded_servers:
+                                logging.warning("Cluster '%s' references non-existent server '%s'. Skipping server.", cluster_name, server_name)
                     
                     # Only add cluster if it has at least one valid server
                     if valid_servers:
@@ -179,18 +280,19 @@ class Config:
                             "servers": valid_servers,
                             "description": cluster_info.get("description", "")
                         }
-                        logging.info(f"Successfully loaded cluster '{cluster_name}' with {len(valid_servers)} servers")
+                        logging.info("Successfully loaded cluster '%s' with %d servers", cluster_name, len(valid_servers))
                     else:
-                        logging.warning(f"Cluster '{cluster_name}' has no valid servers. Skipping cluster.")
+                        logging.warning("Cluster '%s' has no valid servers. Skipping cluster.", cluster_name)
                 except Exception as e:
-                    logging.warning(f"Failed to load cluster '{cluster_name}': {e}. Skipping.")
+                    logging.warning("Failed to load cluster '%s': %s. Skipping.", cluster_name, e)
                     continue
             
             # Build reverse lookup for server to cluster
-            self.server_to_cluster = {}
-            for cluster_name, cluster_info in self.clusters.items():
-                for server_name in cluster_info["servers"]:
-                    self.server_to_cluster[server_name] = cluster_name
+            self.server_to_cluster = {
+                server_name: cluster_name
+                for cluster_name, cluster_info in self.clusters.items()
+                for server_name in cluster_info["servers"]
+            }
             
             # IP Monitor Configuration
             ip_monitor = config.get("ip_monitor", {})
@@ -281,8 +383,22 @@ class Config:
             }
         }
         
+        data = json_utils.dumps_config(config)
+        
         try:
-            with open(self._config_file, 'w') as f:
-                json.dump(config, f, indent=4)
+            with open(self._config_file, 'wb') as f:
+                f.write(data)
         except IOError as e:
             raise RuntimeError(f"Failed to save configuration: {e}")
+
+
+@cache
+def get_config() -> Config:
+    """Return the shared Config instance.
+    
+    Cached so repeated lookups skip Config.__new__; Config.reset() clears it.
+    
+    Returns:
+        The application-wide Config singleton
+    """
+    return Config()
@@ -10,19 +10,49 @@ Supported platforms:
 - Linux: Secret Service API (GNOME Keyring, KDE Wallet)
 - Fallback: Encrypted file storage for headless/CI environments
 """
-import keyring
-import getpass
+import hashlib
+import hmac
 import logging
-import platform
 import os
 import sys
-from typing import Optional, Dict, Any
-import json
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable, Deque, Iterator, Optional, Dict, Any, Tuple
 from pathlib import Path
+import atexit
 import base64
-from cryptography.fernet import Fernet
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+
+from . import json_utils
+
+# keyring, cryptography and getpass are imported where they are used, so
+# importing this module (e.g. from config.py) does not load them up front
+if TYPE_CHECKING:
+    from cryptography.fernet import Fernet
+
+
+@lru_cache(maxsize=128)
+def _mask_key(key: str) -> str:
+    """Mask all but the first four characters of a credential key for logging."""
+    return key[:4] + "*" * (len(key) - 4) if len(key) > 4 else "****"
+
+
+@lru_cache(maxsize=256)
+def _rcon_key(server_name: str) -> str:
+    """Return the credential key holding a server's RCON password."""
+    return f"{CredentialManager.RCON_PASSWORD_PREFIX}{server_name.lower().replace(' ', '_')}"
+
+
+def _remove_key(credentials: Dict[str, str], key: str) -> bool:
+    """Remove a key from a credentials dict, reporting whether it was present."""
+    if key not in credentials:
+        return False
+    del credentials[key]
+    return True
 
 
 class CredentialManager:
@@ -46,22 +76,52 @@ class CredentialManager:
     RCON_PASSWORD_PREFIX = "rcon_password_"
     MASTER_KEY = "master_encryption_key"
     
-    # Platform detection
-    PLATFORM = platform.system().lower()
+    # Platform detection, using the names platform.system() reports
+    PLATFORM = ('linux' if sys.platform.startswith('linux')
+                else 'windows' if sys.platform == 'win32'
+                else sys.platform)
     
     # Fallback encrypted storage
     FALLBACK_DIR = Path.home() / ".funnycommentator" / "secure"
     FALLBACK_FILE = FALLBACK_DIR / "credentials.enc"
+    SALT_FILE = FALLBACK_DIR / "salt.bin"
+    
+    # In-process cache of keyring reads, shared by all instances
+    CACHE_TTL_SECONDS = 60.0
+    CACHE_MAX_ENTRIES = 128
+    _cache: Dict[Tuple[str, str], Tuple[str, float]] = {}
+    _cache_lock = threading.Lock()
+    
+    # Derived fallback keys by (sha256(master password), salt); the KDF is deliberately slow.
+    # Only the most recent few keys (and their Fernets) are kept, as a process
+    # normally uses a single key
+    FALLBACK_KEY_CACHE_SIZE = 4
+    _derived_keys: Dict[Tuple[bytes, bytes], bytes] = {}
+    _fernets: Dict[bytes, 'Fernet'] = {}
+    
+    # Buffered audit records (timestamp, event, masked key, status) when batching is on
+    AUDIT_BATCH_SIZE = 64
+    _audit_buffer: Deque[Tuple[float, str, str, str]] = deque()
+    _audit_lock = threading.Lock()
     
-    def __init__(self, use_enterprise_mode: bool = False, fallback_to_file: bool = True):
+    # Keyring backend name; detection probes every backend (D-Bus on Linux)
+    _keyring_backend_name: Optional[str] = None
+    
+    def __init__(self, use_enterprise_mode: bool = False, fallback_to_file: bool = True,
+                 batch_audit: bool = False):
         """Initialize credential manager with enterprise options.
         
         Args:
             use_enterprise_mode: Enable enterprise features and compliance logging
             fallback_to_file: Allow fallback to encrypted file storage if keyring fails
+            batch_audit: Buffer audit events and log them in batches instead of
+                one record per event (records are flushed at exit)
         """
         self.enterprise_mode = use_enterprise_mode
         self.fallback_enabled = fallback_to_file
+        self.batch_audit = batch_audit
+        self._audit_enabled = False
+        self._fallback_pending: Optional[Dict[str, str]] = None
         self.service_name = self.ENTERPRISE_SERVICE_NAME if use_enterprise_mode else self.SERVICE_NAME
         
         # Setup logging for enterprise compliance
@@ -80,6 +140,7 @@ class CredentialManager:
         """
         # Use the main application logger instead of creating separate audit log
         self.audit_logger = logging.getLogger('credential_audit')
+        self._audit_enabled = True
         
         # Log audit setup to main application log
         logging.info("Credential audit logging initialized - using main application log")
@@ -87,23 +148,149 @@ class CredentialManager:
     def _log_audit_event(self, event: str, key: str, success: bool = True) -> None:
         """Log credential access events for audit purposes.
         
+        Callers check ``self._audit_enabled`` first so non-enterprise managers
+        skip the call entirely.
+        
         Args:
             event: Type of event (store, retrieve, delete)
             key: Credential key (masked for security)
             success: Whether the operation was successful
         """
-        if hasattr(self, 'audit_logger'):
-            masked_key = key[:4] + "*" * (len(key) - 4) if len(key) > 4 else "****"
-            status = "SUCCESS" if success else "FAILED"
-            self.audit_logger.info(f"{event.upper()} - Key: {masked_key} - Status: {status}")
+        status = "SUCCESS" if success else "FAILED"
+        if not self.batch_audit:
+            self.audit_logger.info("%s - Key: %s - Status: %s", event.upper(), _mask_key(key), status)
+            return
+        
+        with self._audit_lock:
+            self._audit_buffer.append((time.time(), event.upper(), _mask_key(key), status))
+            full = len(self._audit_buffer) >= self.AUDIT_BATCH_SIZE
+        if full:
+            self.flush_audit_log()
+    
+    @classmethod
+    def flush_audit_log(cls) -> None:
+        """Write any buffered audit events as a single audit record."""
+        with cls._audit_lock:
+            records = list(cls._audit_buffer)
+            cls._audit_buffer.clear()
+        if records:
+            entries = "; ".join(f"{timestamp:.3f} {event} - Key: {masked_key} - Status: {status}"
+                                for timestamp, event, masked_key, status in records)
+            logging.getLogger('credential_audit').info("AUDIT_BATCH: %s", entries)
+    
+    def _cache_get(self, key: str) -> Optional[str]:
+        """Return a cached keyring value if it has not expired.
+        
+        Args:
+            key: Credential key
+            
+        Returns:
+            Cached credential value or None on a miss
+        """
+        cache_key = (self.service_name, key)
+        with self._cache_lock:
+            entry = self._cache.get(cache_key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self._cache[cache_key]
+                return None
+            return value
+    
+    def _cache_put(self, key: str, value: str) -> None:
+        """Remember a keyring value for CACHE_TTL_SECONDS.
+        
+        Args:
+            key: Credential key
+            value: Credential value
+        """
+        cache_key = (self.service_name, key)
+        with self._cache_lock:
+            self._cache.pop(cache_key, None)
+            if len(self._cache) >= self.CACHE_MAX_ENTRIES:
+                # Drop the oldest entry (dicts keep insertion order)
+                del self._cache[next(iter(self._cache))]
+            self._cache[cache_key] = (value, time.monotonic() + self.CACHE_TTL_SECONDS)
+    
+    def _cache_evict(self, key: str) -> None:
+        """Forget any cached value for a credential.
+        
+        Args:
+            key: Credential key
+        """
+        with self._cache_lock:
+            self._cache.pop((self.service_name, key), None)
+    
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Forget all cached keyring values, derived fallback keys and the backend name."""
+        with cls._cache_lock:
+            cls._cache.clear()
+        cls._derived_keys.clear()
+        cls._fernets.clear()
+        cls._keyring_backend_name = None
     
     def _get_keyring_backend(self) -> str:
-        """Detect and return the available keyring backend."""
+        """Detect and return the available keyring backend.
+        
+        The result is cached for the process; detection failures are not.
+        """
+        if self._keyring_backend_name is None:
+            try:
+                import keyring
+                backend = keyring.get_keyring()
+                backend_name = f"{backend.__module__}.{backend.__class__.__name__}"
+            except Exception:
+                return "Unknown"
+            type(self)._keyring_backend_name = backend_name
+        return self._keyring_backend_name
+    
+    def _enumerate_keyring_keys(self) -> Optional[set]:
+        """List the keys stored under this service with a single keyring query.
+        
+        Only the Secret Service backend (GNOME Keyring, KDE Wallet) supports
+        searching by attributes; other backends return None and callers fall
+        back to per-key lookups.
+        
+        Returns:
+            Set of stored credential keys, or None if enumeration is unsupported
+        """
         try:
+            import keyring
+            from keyring.backends.SecretService import Keyring as SecretServiceKeyring
             backend = keyring.get_keyring()
-            return f"{backend.__module__}.{backend.__class__.__name__}"
-        except Exception:
-            return "Unknown"
+            if not isinstance(backend, SecretServiceKeyring):
+                return None
+            collection = backend.get_preferred_collection()
+            items = collection.search_items({"service": self.service_name})
+            return {item.get_attributes().get("username") for item in items}
+        except Exception as e:
+            logging.debug("Keyring enumeration unavailable: %s", e)
+            return None
+    
+    def _get_fallback_salt(self) -> bytes:
+        """Return the per-installation KDF salt, creating it on first use.
+        
+        Returns:
+            Random salt stored next to the fallback credentials file
+        """
+        try:
+            return self.SALT_FILE.read_bytes()
+        except FileNotFoundError:
+            pass
+        
+        salt = os.urandom(16)
+        self.FALLBACK_DIR.mkdir(parents=True, exist_ok=True)
+        flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+        try:
+            fd = os.open(self.SALT_FILE, flags, 0o600)
+        except FileExistsError:
+            # Another process created the salt first
+            return self.SALT_FILE.read_bytes()
+        with os.fdopen(fd, 'wb') as f:
+            f.write(salt)
+        return salt
     
     def _generate_fallback_key(self, password: str) -> bytes:
         """Generate encryption key from password for fallback storage.
@@ -115,14 +302,68 @@ class CredentialManager:
             Derived encryption key
         """
         password_bytes = password.encode()
-        salt = b'FunnyCommentator_Salt_2025'  # In production, use random salt
+        salt = self._get_fallback_salt()
+        # Keyed by a digest so the master password itself is never kept in memory
+        cache_key = (hashlib.sha256(password_bytes).digest(), salt)
+        derived_key = self._derived_keys.get(cache_key)
+        if derived_key is None:
+            from cryptography.hazmat.primitives.kdf.scrypt import Scrypt
+            kdf = Scrypt(
+                salt=salt,
+                length=32,
+                n=2**14,
+                r=8,
+                p=1,
+            )
+            derived_key = base64.urlsafe_b64encode(kdf.derive(password_bytes))
+            if len(self._derived_keys) >= self.FALLBACK_KEY_CACHE_SIZE:
+                # Drop the oldest entry (dicts keep insertion order)
+                self._derived_keys.pop(next(iter(self._derived_keys)), None)
+            self._derived_keys[cache_key] = derived_key
+        return derived_key
+    
+    def _get_fernet(self, password: str) -> 'Fernet':
+        """Return the Fernet for the fallback key derived from a password.
+        
+        Args:
+            password: User password for key derivation
+            
+        Returns:
+            Fernet instance, shared by all managers using the same key
+        """
+        encryption_key = self._generate_fallback_key(password)
+        fernet = self._fernets.get(encryption_key)
+        if fernet is None:
+            from cryptography.fernet import Fernet
+            if len(self._fernets) >= self.FALLBACK_KEY_CACHE_SIZE:
+                # Drop the oldest entry (dicts keep insertion order)
+                self._fernets.pop(next(iter(self._fernets)), None)
+            fernet = self._fernets[encryption_key] = Fernet(encryption_key)
+        return fernet
+    
+    @staticmethod
+    def _generate_legacy_fallback_key(password: str) -> bytes:
+        """Generate the PBKDF2 key used by fallback files written before scrypt.
+        
+        Only used to read old files; they are re-encrypted with the scrypt key
+        on the next write.
+        
+        Args:
+            password: User password for key derivation
+            
+        Returns:
+            Derived encryption key
+        """
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+        
         kdf = PBKDF2HMAC(
             algorithm=hashes.SHA256(),
             length=32,
-            salt=salt,
+            salt=b'FunnyCommentator_Salt_2025',
             iterations=100000,
         )
-        return base64.urlsafe_b64encode(kdf.derive(password_bytes))
+        return base64.urlsafe_b64encode(kdf.derive(password.encode()))
     
     def _store_credential_fallback(self, key: str, value: str, master_password: str) -> None:
         """Store credential in encrypted file as fallback.
@@ -132,30 +373,120 @@ class CredentialManager:
             value: Credential value
             master_password: Password for encryption
         """
+        # Inside fallback_session() the write is deferred until the session ends
+        if self._fallback_pending is not None:
+            self._fallback_pending[key] = value
+            return
+        
+        def add_credential(credentials: Dict[str, str]) -> bool:
+            credentials[key] = value
+            return True
+        
         try:
-            # Load existing credentials or create new
-            credentials = {}
-            if self.FALLBACK_FILE.exists():
-                credentials = self._load_fallback_credentials(master_password)
+            self._rewrite_fallback(add_credential, master_password)
+        except Exception as e:
+            logging.error("Fallback credential storage failed for %s: %s", key, e)
+            raise
+    
+    def _decrypt_fallback_file(self, master_password: str) -> Dict[str, str]:
+        """Read and decrypt the fallback file.
+        
+        Args:
+            master_password: Password for decryption
             
-            # Add new credential
-            credentials[key] = value
+        Returns:
+            Dictionary of stored credentials
             
-            # Encrypt and save
-            encryption_key = self._generate_fallback_key(master_password)
-            fernet = Fernet(encryption_key)
-            encrypted_data = fernet.encrypt(json.dumps(credentials).encode())
+        Raises:
+            InvalidToken: If the password does not match the file
+        """
+        from cryptography.fernet import Fernet, InvalidToken
+        
+        with open(self.FALLBACK_FILE, 'rb') as f:
+            encrypted_data = f.read()
+        
+        try:
+            decrypted_data = self._get_fernet(master_password).decrypt(encrypted_data)
+        except InvalidToken:
+            # Files written before the switch to scrypt use the legacy PBKDF2 key
+            legacy_fernet = Fernet(self._generate_legacy_fallback_key(master_password))
+            decrypted_data = legacy_fernet.decrypt(encrypted_data)
+        return json_utils.loads(decrypted_data)
+    
+    def _rewrite_fallback(self, mutate: Callable[[Dict[str, str]], bool], master_password: str) -> bool:
+        """Apply a change to the fallback credentials with one decrypt and one write.
+        
+        The file is replaced atomically. A file that cannot be decrypted with
+        ``master_password`` is never overwritten; the decryption error is raised.
+        
+        Args:
+            mutate: Callback that edits the credentials in place and returns
+                True if anything changed
+            master_password: Password for decryption and encryption
             
-            with open(self.FALLBACK_FILE, 'wb') as f:
+        Returns:
+            True if the file was rewritten, False if nothing changed
+        """
+        credentials = self._decrypt_fallback_file(master_password) if self.FALLBACK_FILE.exists() else {}
+        if not mutate(credentials):
+            return False
+        
+        if not credentials:
+            self.FALLBACK_FILE.unlink(missing_ok=True)
+            return True
+        
+        encrypted_data = self._get_fernet(master_password).encrypt(json_utils.dumps(credentials))
+        
+        # Create the temp file owner-only from the start so there is no window
+        # where it is readable before a chmod, and flush it to disk before the
+        # rename so a crash never leaves a truncated credentials file
+        tmp_file = self.FALLBACK_FILE.with_name(self.FALLBACK_FILE.name + ".tmp")
+        tmp_file.unlink(missing_ok=True)  # A leftover temp file would keep its old mode
+        flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+        fd = os.open(tmp_file, flags, 0o600)
+        try:
+            with os.fdopen(fd, 'wb') as f:
                 f.write(encrypted_data)
-            
-            # Set secure permissions (Unix-like systems)
-            if self.PLATFORM in ['linux', 'darwin']:
-                os.chmod(self.FALLBACK_FILE, 0o600)
-                
-        except Exception as e:
-            logging.error(f"Fallback credential storage failed for {key}: {e}")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.FALLBACK_FILE)
+        except BaseException:
+            tmp_file.unlink(missing_ok=True)
             raise
+        return True
+    
+    @contextmanager
+    def fallback_session(self, master_password: Optional[str]) -> Iterator[Dict[str, str]]:
+        """Batch fallback-file writes made through this manager into one rewrite.
+        
+        Credentials that fall back to the encrypted file while the block runs
+        are collected in memory and written together when it exits, so storing
+        N credentials costs one decrypt/encrypt cycle instead of N. Pending
+        credentials are still written if the block raises.
+        
+        Args:
+            master_password: Password for fallback encryption
+            
+        Yields:
+            Dictionary of credentials waiting to be written
+        """
+        if self._fallback_pending is not None:
+            # Already inside a session; the outer one writes everything
+            yield self._fallback_pending
+            return
+        
+        pending: Dict[str, str] = {}
+        self._fallback_pending = pending
+        try:
+            yield pending
+        finally:
+            self._fallback_pending = None
+            if pending and master_password:
+                def add_credentials(credentials: Dict[str, str]) -> bool:
+                    credentials.update(pending)
+                    return True
+                self._rewrite_fallback(add_credentials, master_password)
+                logging.info("Stored %d credential(s) in fallback storage", len(pending))
     
     def _load_fallback_credentials(self, master_password: str) -> Dict[str, str]:
         """Load credentials from encrypted fallback file.
@@ -169,18 +500,10 @@ class CredentialManager:
         try:
             if not self.FALLBACK_FILE.exists():
                 return {}
-            
-            encryption_key = self._generate_fallback_key(master_password)
-            fernet = Fernet(encryption_key)
-            
-            with open(self.FALLBACK_FILE, 'rb') as f:
-                encrypted_data = f.read()
-            
-            decrypted_data = fernet.decrypt(encrypted_data)
-            return json.loads(decrypted_data.decode())
+            return self._decrypt_fallback_file(master_password)
             
         except Exception as e:
-            logging.error(f"Failed to load fallback credentials: {e}")
+            logging.error("Failed to load fallback credentials: %s", e)
             return {}
     
     def _get_credential_fallback(self, key: str, master_password: str) -> Optional[str]:
@@ -197,7 +520,7 @@ class CredentialManager:
             credentials = self._load_fallback_credentials(master_password)
             return credentials.get(key)
         except Exception as e:
-            logging.error(f"Failed to retrieve fallback credential {key}: {e}")
+            logging.error("Failed to retrieve fallback credential %s: %s", key, e)
             return None
     
     @classmethod
@@ -221,29 +544,33 @@ class CredentialManager:
             master_password: Password for fallback encryption (if needed)
         """
         success = False
+        self._cache_evict(key)
         
         try:
             # Try keyring first
+            import keyring
             keyring.set_password(self.service_name, key, value)
-            logging.info(f"Stored credential in keyring: {key}")
+            logging.info("Stored credential in keyring: %s", key)
+            self._cache_put(key, value)
             success = True
             
         except Exception as keyring_error:
-            logging.warning(f"Keyring storage failed for {key}: {keyring_error}")
+            logging.warning("Keyring storage failed for %s: %s", key, keyring_error)
             
             # Fallback to encrypted file if enabled
             if self.fallback_enabled and master_password:
                 try:
                     self._store_credential_fallback(key, value, master_password)
-                    logging.info(f"Stored credential in fallback storage: {key}")
+                    logging.info("Stored credential in fallback storage: %s", key)
                     success = True
                 except Exception as fallback_error:
-                    logging.error(f"Fallback storage failed for {key}: {fallback_error}")
+                    logging.error("Fallback storage failed for %s: %s", key, fallback_error)
             else:
-                logging.error(f"No fallback available for credential {key}")
+                logging.error("No fallback available for credential %s", key)
         
         # Audit logging
-        self._log_audit_event("store", key, success)
+        if self._audit_enabled:
+            self._log_audit_event("store", key, success)
         
         if not success:
             raise RuntimeError(f"Failed to store credential {key} in any available backend")
@@ -258,20 +585,29 @@ class CredentialManager:
         Returns:
             The credential value or None if not found
         """
-        value = None
         success = False
         
+        # Serve repeated lookups from the in-process cache to skip the keyring IPC
+        value = self._cache_get(key)
+        if value is not None:
+            logging.debug("Retrieved credential from cache: %s", key)
+            if self._audit_enabled:
+                self._log_audit_event("retrieve", key, True)
+            return value
+        
         try:
             # Try keyring first
+            import keyring
             value = keyring.get_password(self.service_name, key)
             if value is not None:
                 success = True
-                logging.debug(f"Retrieved credential from keyring: {key}")
+                self._cache_put(key, value)
+                logging.debug("Retrieved credential from keyring: %s", key)
             else:
-                logging.debug(f"Credential not found in keyring: {key}")
+                logging.debug("Credential not found in keyring: %s", key)
                 
         except Exception as keyring_error:
-            logging.warning(f"Keyring retrieval failed for {key}: {keyring_error}")
+            logging.warning("Keyring retrieval failed for %s: %s", key, keyring_error)
         
         # Try fallback if keyring failed or returned None
         if value is None and self.fallback_enabled and master_password:
@@ -279,15 +615,16 @@ class CredentialManager:
                 value = self._get_credential_fallback(key, master_password)
                 if value is not None:
                     success = True
-                    logging.debug(f"Retrieved credential from fallback storage: {key}")
+                    logging.debug("Retrieved credential from fallback storage: %s", key)
             except Exception as fallback_error:
-                logging.warning(f"Fallback retrieval failed for {key}: {fallback_error}")
+                logging.warning("Fallback retrieval failed for %s: %s", key, fallback_error)
         
         # Audit logging
-        self._log_audit_event("retrieve", key, success)
+        if self._audit_enabled:
+            self._log_audit_event("retrieve", key, success)
         
         if value is None:
-            logging.warning(f"Credential not found in any backend: {key}")
+            logging.warning("Credential not found in any backend: %s", key)
         
         return value
     
@@ -299,34 +636,29 @@ class CredentialManager:
             master_password: Password for fallback access (if needed)
         """
         success = False
+        self._cache_evict(key)
         
         # Delete from keyring
         try:
+            import keyring
             keyring.delete_password(self.service_name, key)
-            logging.info(f"Deleted credential from keyring: {key}")
+            logging.info("Deleted credential from keyring: %s", key)
             success = True
         except Exception as keyring_error:
-            logging.warning(f"Keyring deletion failed for {key}: {keyring_error}")
+            logging.warning("Keyring deletion failed for %s: %s", key, keyring_error)
         
         # Delete from fallback storage
         if self.fallback_enabled and master_password:
             try:
-                credentials = self._load_fallback_credentials(master_password)
-                if key in credentials:
-                    del credentials[key]
-                    # Re-encrypt and save
-                    encryption_key = self._generate_fallback_key(master_password)
-                    fernet = Fernet(encryption_key)
-                    encrypted_data = fernet.encrypt(json.dumps(credentials).encode())
-                    with open(self.FALLBACK_FILE, 'wb') as f:
-                        f.write(encrypted_data)
-                    logging.info(f"Deleted credential from fallback storage: {key}")
+                if self._rewrite_fallback(lambda credentials: _remove_key(credentials, key), master_password):
+                    logging.info("Deleted credential from fallback storage: %s", key)
                     success = True
             except Exception as fallback_error:
-                logging.warning(f"Fallback deletion failed for {key}: {fallback_error}")
+                logging.warning("Fallback deletion failed for %s: %s", key, fallback_error)
         
         # Audit logging
-        self._log_audit_event("delete", key, success)
+        if self._audit_enabled:
+            self._log_audit_event("delete", key, success)
     
     def get_system_info(self) -> Dict[str, Any]:
         """Get system information for enterprise monitoring.
@@ -334,6 +666,8 @@ class CredentialManager:
         Returns:
             Dictionary with system and security information
         """
+        import getpass
+        
         return {
             "platform": self.PLATFORM,
             "keyring_backend": self._get_keyring_backend(),
@@ -345,64 +679,95 @@ class CredentialManager:
             "python_version": sys.version,
         }
     
-    def validate_credential_access(self) -> Dict[str, bool]:
-        """Validate that credential storage/retrieval is working.
+    _VALIDATION_KEY = "test_validation_key"
+    _VALIDATION_VALUE = "test_value_12345"
+    
+    def _validate_keyring(self) -> Dict[str, bool]:
+        """Check that the keyring backend can store, read and delete a value.
         
         Returns:
-            Dictionary with validation results for each backend
+            Keyring availability and read/write results
         """
-        results = {
-            "keyring_available": False,
-            "keyring_read_write": False,
-            "fallback_available": False,
-            "fallback_read_write": False,
-        }
-        
-        test_key = "test_validation_key"
-        test_value = "test_value_12345"
-        
-        # Test keyring
+        results = {"keyring_available": False, "keyring_read_write": False}
         try:
-            keyring.set_password(self.service_name, test_key, test_value)
+            import keyring
+            keyring.set_password(self.service_name, self._VALIDATION_KEY, self._VALIDATION_VALUE)
             results["keyring_available"] = True
             
-            retrieved = keyring.get_password(self.service_name, test_key)
-            if retrieved == test_value:
+            retrieved = keyring.get_password(self.service_name, self._VALIDATION_KEY)
+            if hmac.compare_digest((retrieved or "").encode(), self._VALIDATION_VALUE.encode()):
                 results["keyring_read_write"] = True
             
             # Cleanup
-            keyring.delete_password(self.service_name, test_key)
+            keyring.delete_password(self.service_name, self._VALIDATION_KEY)
             
         except Exception as e:
-            logging.debug(f"Keyring validation failed: {e}")
+            logging.debug("Keyring validation failed: %s", e)
+        return results
+    
+    def _validate_fallback(self) -> Dict[str, bool]:
+        """Check that the encrypted fallback file can store, read and delete a value.
         
-        # Test fallback
-        if self.fallback_enabled:
-            try:
+        The check runs against a throwaway file in a temporary directory, so
+        the user's real credentials file (and its master password) is never
+        touched.
+        
+        Returns:
+            Fallback availability and read/write results
+        """
+        results = {"fallback_available": False, "fallback_read_write": False}
+        test_key = self._VALIDATION_KEY
+        try:
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                probe = type(self)(fallback_to_file=False)
+                # The probe's random salt is never used again, so keep its derived
+                # key out of the shared caches
+                probe._derived_keys = {}
+                probe._fernets = {}
+                probe.FALLBACK_DIR = Path(tmp_dir)
+                probe.FALLBACK_FILE = probe.FALLBACK_DIR / self.FALLBACK_FILE.name
+                probe.SALT_FILE = probe.FALLBACK_DIR / self.SALT_FILE.name
+                
                 test_password = "test_master_password"
-                self._store_credential_fallback(test_key, test_value, test_password)
+                probe._store_credential_fallback(test_key, self._VALIDATION_VALUE, test_password)
                 results["fallback_available"] = True
                 
-                retrieved = self._get_credential_fallback(test_key, test_password)
-                if retrieved == test_value:
+                retrieved = probe._get_credential_fallback(test_key, test_password)
+                if hmac.compare_digest((retrieved or "").encode(), self._VALIDATION_VALUE.encode()):
                     results["fallback_read_write"] = True
                 
                 # Cleanup
-                if self.FALLBACK_FILE.exists():
-                    credentials = self._load_fallback_credentials(test_password)
-                    if test_key in credentials:
-                        del credentials[test_key]
-                        if credentials:
-                            encryption_key = self._generate_fallback_key(test_password)
-                            fernet = Fernet(encryption_key)
-                            encrypted_data = fernet.encrypt(json.dumps(credentials).encode())
-                            with open(self.FALLBACK_FILE, 'wb') as f:
-                                f.write(encrypted_data)
-                        else:
-                            self.FALLBACK_FILE.unlink()
-                            
-            except Exception as e:
-                logging.debug(f"Fallback validation failed: {e}")
+                probe._rewrite_fallback(lambda credentials: _remove_key(credentials, test_key), test_password)
+                        
+        except Exception as e:
+            logging.debug("Fallback validation failed: %s", e)
+        return results
+    
+    def validate_credential_access(self) -> Dict[str, bool]:
+        """Validate that credential storage/retrieval is working.
+        
+        The keyring check (IPC-bound) and the fallback check (KDF-bound) are
+        independent, so they run concurrently.
+        
+        Returns:
+            Dictionary with validation results for each backend
+        """
+        results = {
+            "keyring_available": False,
+            "keyring_read_write": False,
+            "fallback_available": False,
+            "fallback_read_write": False,
+        }
+        
+        if not self.fallback_enabled:
+            results.update(self._validate_keyring())
+            return results
+        
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            keyring_check = executor.submit(self._validate_keyring)
+            fallback_check = executor.submit(self._validate_fallback)
+            results.update(keyring_check.result())
+            results.update(fallback_check.result())
         
         return results
     
@@ -440,7 +805,7 @@ class CredentialManager:
             password: RCON password
             master_password: Optional master password for fallback storage
         """
-        key = f"{cls.RCON_PASSWORD_PREFIX}{server_name.lower().replace(' ', '_')}"
+        key = _rcon_key(server_name)
         manager = cls()
         manager.store_credential(key, password, master_password)
     
@@ -455,7 +820,7 @@ class CredentialManager:
         Returns:
             RCON password or None if not found
         """
-        key = f"{cls.RCON_PASSWORD_PREFIX}{server_name.lower().replace(' ', '_')}"
+        key = _rcon_key(server_name)
         manager = cls()
         return manager.get_credential(key, master_password)
     
@@ -468,26 +833,33 @@ class CredentialManager:
             master_password: Optional master password for fallback storage
         """
         try:
-            with open(config_file, 'r') as f:
-                config = json.load(f)
+            with open(config_file, 'rb') as f:
+                config = json_utils.loads(f.read())
             
             manager = cls()
+            migrated = 0
             
-            # Store Discord token
-            discord_token = config.get("discord", {}).get("token")
-            if discord_token and discord_token != "STORED_IN_KEYRING":
-                manager.store_credential(cls.DISCORD_TOKEN, discord_token, master_password)
-                print(f"✓ Stored Discord token in secure storage")
+            # Credentials that fall back to the encrypted file are written once at the end
+            with manager.fallback_session(master_password):
+                # Store Discord token
+                discord_token = config.get("discord", {}).get("token")
+                if discord_token and discord_token != "STORED_IN_KEYRING":
+                    manager.store_credential(cls.DISCORD_TOKEN, discord_token, master_password)
+                    migrated += 1
+                    print(f"✓ Stored Discord token in secure storage")
+                
+                # Store RCON passwords
+                servers = config.get("servers", [])
+                for server in servers:
+                    server_name = server.get("name")
+                    rcon_password = server.get("rcon_password")
+                    if server_name and rcon_password and rcon_password != "STORED_IN_KEYRING":
+                        key = _rcon_key(server_name)
+                        manager.store_credential(key, rcon_password, master_password)
+                        migrated += 1
+                        print(f"✓ Stored RCON password for '{server_name}' in secure storage")
             
-            # Store RCON passwords
-            servers = config.get("servers", [])
-            for server in servers:
-                server_name = server.get("name")
-                rcon_password = server.get("rcon_password")
-                if server_name and rcon_password and rcon_password != "STORED_IN_KEYRING":
-                    key = f"{cls.RCON_PASSWORD_PREFIX}{server_name.lower().replace(' ', '_')}"
-                    manager.store_credential(key, rcon_password, master_password)
-                    print(f"✓ Stored RCON password for '{server_name}' in secure storage")
+            logging.info("Migrated %d credential(s) from %s", migrated, config_file)
             
             # Remove sensitive data from config
             if "discord" in config and "token" in config["discord"]:
@@ -498,15 +870,15 @@ class CredentialManager:
                     server["rcon_password"] = "STORED_IN_KEYRING"
             
             # Write cleaned config back
-            with open(config_file, 'w') as f:
-                json.dump(config, f, indent=4)
+            with open(config_file, 'wb') as f:
+                f.write(json_utils.dumps_config(config))
             
             print(f"✓ Updated {config_file} with keyring references")
             print("\nCredentials have been securely stored.")
             print("The config file now contains placeholder values and is safe to commit to git.")
             
         except Exception as e:
-            logging.error(f"Failed to migrate credentials: {e}")
+            logging.error("Failed to migrate credentials: %s", e)
             raise
     
     @classmethod
@@ -516,6 +888,8 @@ class CredentialManager:
         Args:
             enterprise_mode: Enable enterprise features
         """
+        import getpass
+        
         manager = cls(use_enterprise_mode=enterprise_mode)
         
         print("Setting up secure credential storage...")
@@ -527,25 +901,27 @@ class CredentialManager:
             if use_fallback:
                 master_password = getpass.getpass("Enter master password for fallback encryption: ")
         
-        # Discord token
-        discord_token = getpass.getpass("Enter your Discord bot token: ")
-        if discord_token.strip():
-            manager.store_credential(cls.DISCORD_TOKEN, discord_token.strip(), master_password)
-            print("✓ Discord token stored securely")
-        
-        # RCON passwords
-        print("\nNow enter RCON passwords for your servers:")
-        
-        while True:
-            server_name = input("Enter server name (or press Enter to finish): ").strip()
-            if not server_name:
-                break
+        # Collect fallback writes and flush them once at the end
+        with manager.fallback_session(master_password):
+            # Discord token
+            discord_token = getpass.getpass("Enter your Discord bot token: ")
+            if discord_token.strip():
+                manager.store_credential(cls.DISCORD_TOKEN, discord_token.strip(), master_password)
+                print("✓ Discord token stored securely")
+            
+            # RCON passwords
+            print("\nNow enter RCON passwords for your servers:")
             
-            rcon_password = getpass.getpass(f"Enter RCON password for '{server_name}': ")
-            if rcon_password.strip():
-                key = f"{cls.RCON_PASSWORD_PREFIX}{server_name.lower().replace(' ', '_')}"
-                manager.store_credential(key, rcon_password.strip(), master_password)
-                print(f"✓ RCON password for '{server_name}' stored securely")
+            while True:
+                server_name = input("Enter server name (or press Enter to finish): ").strip()
+                if not server_name:
+                    break
+                
+                rcon_password = getpass.getpass(f"Enter RCON password for '{server_name}': ")
+                if rcon_password.strip():
+                    key = _rcon_key(server_name)
+                    manager.store_credential(key, rcon_password.strip(), master_password)
+                    print(f"✓ RCON password for '{server_name}' stored securely")
         
         print(f"\n✓ All credentials stored securely")
         print("You can now safely commit your config files to git.")
@@ -584,32 +960,33 @@ class CredentialManager:
         Returns:
             Number of stored credentials
         """
-        count = 0
-        
-        try:
-            # Check Discord token
-            if self.get_credential(self.DISCORD_TOKEN, master_password):
-                count += 1
-        except Exception:
-            pass
+        keys = [self.DISCORD_TOKEN]
         
         # Count RCON passwords for each server
         # We need to load config to know which servers exist
         try:
-            from src.config import Config
-            config = Config()
-            
-            for server_name in config.servers:
-                try:
-                    rcon_key = f"{self.RCON_PASSWORD_PREFIX}{server_name.lower().replace(' ', '_')}"
-                    if self.get_credential(rcon_key, master_password):
-                        count += 1
-                except Exception:
-                    pass
+            from src.config import get_config
+            config = get_config()
+            keys.extend(_rcon_key(server_name) for server_name in config.servers)
         except Exception:
-            # If we can't load config, just return what we have
+            # If we can't load config, just count the Discord token
             pass
         
+        # One bulk query instead of a keyring round-trip per key, where the backend allows it
+        stored_keys = self._enumerate_keyring_keys()
+        if stored_keys is not None:
+            if self.fallback_enabled and master_password:
+                stored_keys.update(self._load_fallback_credentials(master_password))
+            return sum(1 for key in keys if key in stored_keys)
+        
+        count = 0
+        for key in keys:
+            try:
+                if self.get_credential(key, master_password):
+                    count += 1
+            except Exception:
+                pass
+        
         return count
         
         # Show system info
@@ -626,6 +1003,10 @@ class CredentialManager:
             print(f"{status_icon} {backend}")
 
 
+# Don't lose buffered audit events on shutdown
+atexit.register(CredentialManager.flush_audit_log)
+
+
 def main():
     """CLI interface for enterprise credential management."""
     import sys
@@ -4,9 +4,38 @@ This module handles all database-related operations including initialization,
 saving and retrieving summaries. Following PEP 257 for docstring conventions.
 """
 import sqlite3
+import threading
 import zlib
+from contextlib import contextmanager
+from functools import lru_cache
 from typing import List, Dict
-import tiktoken
+
+try:
+    import zstandard  # Optional: better ratio and faster decompression than zlib
+except ImportError:
+    zstandard = None
+
+# Summaries are written once and read many times, so favour ratio over write speed
+_COMPRESSION_LEVEL = 9
+
+# Every zstd frame starts with this; zlib streams start with 0x78, so both can share a column
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+@lru_cache(maxsize=8)
+def _get_encoding(model: str) -> "tiktoken.Encoding":
+    """Return the tiktoken encoding for a model, building it only once.
+    
+    Args:
+        model: The model name to look up the encoding for
+    
+    Returns:
+        Cached tiktoken encoding
+    """
+    # tiktoken loads large regex/BPE tables, so defer it until tokens are counted
+    import tiktoken
+    return tiktoken.encoding_for_model(model)
+
 
 class DatabaseManager:
     """Database manager class for handling all database operations."""
@@ -20,20 +49,78 @@ class DatabaseManager:
         """
         self.db_path = db_path
         self.server_tables = server_tables
+        # Build each table's SQL once so sqlite3's statement cache always hits
+        self._insert_sql = {
+            server: f"INSERT INTO {table} (summary, token_count) VALUES (?, ?)"
+            for server, table in server_tables.items()
+        }
+        self._select_sql = {
+            server: f"""
+                SELECT summary FROM {table}
+                WHERE id IN (
+                    SELECT id FROM (
+                        SELECT id, SUM(token_count) OVER (ORDER BY id DESC) AS running_tokens
+                        FROM {table}
+                    )
+                    WHERE running_tokens <= ?
+                )
+                ORDER BY id ASC
+            """
+            for server, table in server_tables.items()
+        }
+        self._lock = threading.Lock()
+        self._conn = self._connect()
         self._init_db()
     
+    def _connect(self) -> sqlite3.Connection:
+        """Open the long-lived connection shared by this manager.
+        
+        The connection runs in autocommit mode with WAL journaling so readers
+        in other modules are not blocked while summaries are written.
+        
+        Returns:
+            Configured SQLite connection
+        """
+        conn = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA mmap_size=268435456")
+        conn.execute("PRAGMA cache_size=-65536")  # 64 MiB page cache
+        return conn
+    
+    @contextmanager
+    def _transaction(self):
+        """Group writes on the shared connection into one IMMEDIATE transaction.
+        
+        The caller must already hold ``self._lock``.
+        
+        Yields:
+            The shared SQLite connection
+        """
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self._conn
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+    
     def _init_db(self) -> None:
         """Initialize the database with required tables for each server and clusters."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._lock, self._transaction() as conn:
             # Create tables for individual servers
             for table_name in self.server_tables.values():
                 conn.execute(f"""
                     CREATE TABLE IF NOT EXISTS {table_name} (
                         id INTEGER PRIMARY KEY AUTOINCREMENT,
                         timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                        summary BLOB
+                        summary BLOB,
+                        token_count INTEGER
                     )
                 """)
+                self._ensure_column(conn, table_name, "token_count", "INTEGER")
+                self._backfill_token_counts(conn, table_name)
             
             # Create table for cluster summaries
             conn.execute("""
@@ -41,9 +128,16 @@ class DatabaseManager:
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     cluster_name TEXT,
                     timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    summary BLOB
+                    summary BLOB,
+                    token_count INTEGER
                 )
             """)
+            self._ensure_column(conn, "cluster_summaries", "token_count", "INTEGER")
+            self._backfill_token_counts(conn, "cluster_summaries")
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS ix_cluster_summaries_name_id
+                ON cluster_summaries (cluster_name, id DESC)
+            """)
             
             # Create table for IP history tracking
             conn.execute("""
@@ -56,6 +150,42 @@ class DatabaseManager:
                     notified BOOLEAN DEFAULT FALSE
                 )
             """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS ix_ip_history_changed_at
+                ON ip_history (changed_at DESC)
+            """)
+    
+    @staticmethod
+    def _ensure_column(conn: sqlite3.Connection, table_name: str, column: str, column_type: str) -> None:
+        """Add a column to an existing table if it is missing.
+        
+        Args:
+            conn: Open database connection
+            table_name: Table to check
+            column: Column name to add
+            column_type: SQLite type of the column
+        """
+        columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table_name})")}
+        if column not in columns:
+            conn.execute(f"ALTER TABLE {table_name} ADD COLUMN {column} {column_type}")
+    
+    def _backfill_token_counts(self, conn: sqlite3.Connection, table_name: str) -> None:
+        """Fill in token counts for rows written before token_count existed.
+        
+        Args:
+            conn: Open database connection
+            table_name: Summary table to backfill
+        """
+        rows = conn.execute(
+            f"SELECT id, summary FROM {table_name} WHERE token_count IS NULL"
+        ).fetchall()
+        if rows:
+            texts = [self._decompress_text(blob) for _, blob in rows]
+            token_lists = _get_encoding("gpt-3.5-turbo").encode_ordinary_batch(texts)
+            conn.executemany(
+                f"UPDATE {table_name} SET token_count = ? WHERE id = ?",
+                [(len(tokens), row_id) for (row_id, _), tokens in zip(rows, token_lists)]
+            )
     
     def save_summary(self, server_name: str, summary: str) -> None:
         """Save a compressed summary to the server's table.
@@ -64,10 +194,29 @@ class DatabaseManager:
             server_name: Name of the server this summary is for
             summary: The summary text to save
         """
-        table_name = self.server_tables[server_name]
-        compressed = zlib.compress(summary.encode("utf-8"))
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(f"INSERT INTO {table_name} (summary) VALUES (?)", (compressed,))
+        insert_sql = self._insert_sql[server_name]
+        compressed = self._compress_text(summary)
+        token_count = self.count_tokens(summary)
+        with self._lock, self._transaction() as conn:
+            conn.execute(insert_sql, (compressed, token_count))
+    
+    def save_summaries(self, server_name: str, summaries: List[str]) -> None:
+        """Save several compressed summaries to the server's table in one transaction.
+        
+        Args:
+            server_name: Name of the server these summaries are for
+            summaries: Summary texts to save, oldest first
+        """
+        if not summaries:
+            return
+        insert_sql = self._insert_sql[server_name]
+        token_lists = _get_encoding("gpt-3.5-turbo").encode_ordinary_batch(summaries)
+        rows = [
+            (self._compress_text(summary), len(tokens))
+            for summary, tokens in zip(summaries, token_lists)
+        ]
+        with self._lock, self._transaction() as conn:
+            conn.executemany(insert_sql, rows)
     
     @staticmethod
     def count_tokens(text: str, model: str = "gpt-3.5-turbo") -> int:
@@ -80,19 +229,43 @@ class DatabaseManager:
         Returns:
             Number of tokens in the text
         """
-        enc = tiktoken.encoding_for_model(model)
-        return len(enc.encode(text))
+        # encode_ordinary treats special-token strings such as <|endoftext|> as plain
+        # text (encode() raises on them) and matches the batched backfill counts
+        return len(_get_encoding(model).encode_ordinary(text))
+    
+    @staticmethod
+    def _compress_text(text: str) -> bytes:
+        """Compress text for storage in the database.
+        
+        Uses zstd when the zstandard package is installed, zlib otherwise.
+        
+        Args:
+            text: Text to compress
+            
+        Returns:
+            Compressed bytes
+        """
+        if zstandard:
+            return zstandard.compress(text.encode("utf-8"), _COMPRESSION_LEVEL)
+        return zlib.compress(text.encode("utf-8"), _COMPRESSION_LEVEL)
     
     @staticmethod
     def _decompress_text(compressed_data: bytes) -> str:
         """Decompress text data from the database.
         
+        The format is detected per blob, so zlib rows written before zstd was
+        available stay readable.
+        
         Args:
             compressed_data: Compressed bytes from database
             
         Returns:
             Decompressed text string
         """
+        if compressed_data[:4] == _ZSTD_MAGIC:
+            if zstandard is None:
+                raise RuntimeError("Summary is zstd-compressed but the zstandard package is not installed")
+            return zstandard.decompress(compressed_data).decode("utf-8")
         return zlib.decompress(compressed_data).decode("utf-8")
     
     def get_summaries_up_to_token_limit(self, server_name: str, token_limit: int) -> List[str]:
@@ -105,23 +278,11 @@ class DatabaseManager:
         Returns:
             List of summaries within the token limit
         """
-        table_name = self.server_tables[server_name]
-        with sqlite3.connect(self.db_path) as conn:
-            rows = conn.execute(f"SELECT summary FROM {table_name} ORDER BY id DESC")
-            summaries = []
-            total_tokens = 0
-            
-            for row in rows:
-                summary = zlib.decompress(row[0]).decode("utf-8")
-                tokens = self.count_tokens(summary)
-                
-                if total_tokens + tokens > token_limit:
-                    break
-                    
-                summaries.insert(0, summary)  # Keep chronological order
-                total_tokens += tokens
-                
-            return summaries
+        select_sql = self._select_sql[server_name]
+        with self._lock:
+            # Let SQLite keep the running total so only rows within budget come back
+            rows = self._conn.execute(select_sql, (token_limit,))
+            return [self._decompress_text(row[0]) for row in rows]
     
     def save_cluster_summary(self, cluster_name: str, summary: str) -> None:
         """Save a compressed summary for a cluster.
@@ -130,11 +291,12 @@ class DatabaseManager:
             cluster_name: Name of the cluster this summary is for
             summary: The summary text to save
         """
-        compressed = zlib.compress(summary.encode("utf-8"))
-        with sqlite3.connect(self.db_path) as conn:
+        compressed = self._compress_text(summary)
+        token_count = self.count_tokens(summary)
+        with self._lock, self._transaction() as conn:
             conn.execute(
-                "INSERT INTO cluster_summaries (cluster_name, summary) VALUES (?, ?)",
-                (cluster_name, compressed)
+                "INSERT INTO cluster_summaries (cluster_name, summary, token_count) VALUES (?, ?, ?)",
+                (cluster_name, compressed, token_count)
             )
 
     def get_cluster_summaries_up_to_token_limit(self, cluster_name: str, token_limit: int) -> List[str]:
@@ -147,33 +309,34 @@ class DatabaseManager:
         Returns:
             List of cluster summaries within the token limit
         """
-        with sqlite3.connect(self.db_path) as conn:
-            rows = conn.execute(
-                "SELECT summary FROM cluster_summaries WHERE cluster_name = ? ORDER BY id DESC",
-                (cluster_name,)
-            )
-            summaries = []
-            total_tokens = 0
-            
-            for row in rows:
-                summary = zlib.decompress(row[0]).decode("utf-8")
-                tokens = self.count_tokens(summary)
-                
-                if total_tokens + tokens > token_limit:
-                    break
-                    
-                summaries.insert(0, summary)  # Keep chronological order
-                total_tokens += tokens
-                
-            return summaries
+        with self._lock:
+            # Same running-total query as get_summaries_up_to_token_limit, per cluster
+            rows = self._conn.execute("""
+                SELECT summary FROM cluster_summaries
+                WHERE id IN (
+                    SELECT id FROM (
+                        SELECT id, SUM(token_count) OVER (ORDER BY id DESC) AS running_tokens
+                        FROM cluster_summaries
+                        WHERE cluster_name = ?
+                    )
+                    WHERE running_tokens <= ?
+                )
+                ORDER BY id ASC
+            """, (cluster_name, token_limit))
+            return [self._decompress_text(row[0]) for row in rows]
             
     def close(self) -> None:
-        """Close any open database connections.
-        
-        Note: SQLite connections are closed automatically after each transaction,
-        but this method exists for consistency with other database interfaces.
-        """
-        pass  # Connections are managed by context managers
+        """Close the shared database connection."""
+        with self._lock:
+            self._conn.close()
+    
+    def __enter__(self) -> "DatabaseManager":
+        """Use the manager as a context manager that closes its connection on exit."""
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """Close the shared database connection."""
+        self.close()
     
     def log_ip_change(self, old_ip: str, new_ip: str, change_type: str = 'auto') -> None:
         """Log an IP address change to the database.
@@ -183,7 +346,7 @@ class DatabaseManager:
             new_ip: New IP address  
             change_type: Type of change ('auto', 'manual', 'startup')
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._lock, self._transaction() as conn:
             conn.execute("""
                 INSERT INTO ip_history (ip_address, old_ip_address, change_type, notified)
                 VALUES (?, ?, ?, ?)
@@ -198,9 +361,10 @@ class DatabaseManager:
         Returns:
             List of dictionaries containing IP history records
         """
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute("""
+        with self._lock:
+            cursor = self._conn.cursor()
+            cursor.row_factory = sqlite3.Row
+            cursor.execute("""
                 SELECT id, ip_address, old_ip_address, changed_at, change_type, notified
                 FROM ip_history 
                 ORDER BY changed_at DESC 
@@ -215,9 +379,10 @@ class DatabaseManager:
         Returns:
             Dictionary containing the latest IP record or empty dict
         """
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute("""
+        with self._lock:
+            cursor = self._conn.cursor()
+            cursor.row_factory = sqlite3.Row
+            cursor.execute("""
                 SELECT ip_address, changed_at, change_type
                 FROM ip_history 
                 ORDER BY changed_at DESC 
@@ -233,9 +398,18 @@ class DatabaseManager:
         Args:
             ip_record_id: ID of the IP history record to mark as notified
         """
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                UPDATE ip_history 
-                SET notified = TRUE 
-                WHERE id = ?
-            """, (ip_record_id,))
+        self.mark_ip_changes_notified([ip_record_id])
+    
+    def mark_ip_changes_notified(self, ip_record_ids: List[int]) -> None:
+        """Mark several IP changes as notified in a single transaction.
+        
+        Args:
+            ip_record_ids: IDs of the IP history records to mark as notified
+        """
+        if not ip_record_ids:
+            return
+        with self._lock, self._transaction() as conn:
+            conn.executemany(
+                "UPDATE ip_history SET notified = TRUE WHERE id = ?",
+                [(record_id,) for record_id in ip_record_ids]
+            )
@@ -5,11 +5,72 @@ and client setup. Following PEP 257 for docstring conventions.
 """
 import asyncio
 import logging
-from typing import List, Dict, Optional
+import time
+from typing import List, Dict, Optional, Tuple
 import discord
 from discord.ext import tasks
 import aiohttp
 
+from . import json_utils
+
+# Natural break points in order of preference, with the offset applied to the split position
+_BREAK_POINTS = (
+    ('\n\n', -2),  # Paragraph breaks
+    ('\n', -1),    # Line breaks
+    ('. ', 0),     # Sentence endings
+    ('! ', 0),     # Exclamation endings
+    ('? ', 0),     # Question endings
+    (', ', 0),     # Comma breaks
+    (' ', 0),      # Word boundaries
+)
+
+# Messages endpoint for a channel id
+_CHANNEL_MESSAGES_URL = "https://discord.com/api/v10/channels/{}/messages".format
+
+# How many times a chunk is retried after a 429 before giving up
+_RATE_LIMIT_RETRIES = 3
+
+# Client-side send budget per channel, matching Discord's 5 messages per 5 seconds
+_CHANNEL_RATE = 5
+_CHANNEL_PERIOD = 5.0
+
+
+class _TokenBucket:
+    """Token bucket that paces sends so bursts never reach Discord's 429 backoff.
+    
+    Tokens refill continuously, and a send that finds the bucket empty
+    reserves the next free slot, so concurrent callers queue up in order.
+    """
+    
+    def __init__(self, rate: int, period: float):
+        """Initialize a full bucket.
+        
+        Args:
+            rate: Number of sends allowed per period
+            period: Length of the period in seconds
+        """
+        self.capacity = float(rate)
+        self.fill_rate = rate / period
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+    
+    def reserve(self) -> float:
+        """Take a token, returning how many seconds to wait before using it."""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.fill_rate)
+        self._updated = now
+        self._tokens -= 1
+        if self._tokens >= 0:
+            return 0.0
+        return -self._tokens / self.fill_rate
+    
+    async def acquire(self) -> None:
+        """Wait until a send is allowed."""
+        delay = self.reserve()
+        if delay:
+            await asyncio.sleep(delay)
+
+
 class DiscordManager:
     """Discord client manager for handling Discord operations."""
     
@@ -22,6 +83,14 @@ class DiscordManager:
         """
         self.token = token
         self.use_client = use_client
+        self._headers = {
+            "Authorization": f"Bot {token}",
+            "Content-Type": "application/json"
+        }
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Send pacing per channel messages URL
+        self._buckets: Dict[str, _TokenBucket] = {}
         
         if use_client:
             intents = discord.Intents.default()
@@ -34,6 +103,9 @@ class DiscordManager:
     def split_text_on_word_boundaries(text: str, max_length: int = 2000) -> List[str]:
         """Split text into chunks that respect Discord's message length limit and preserve formatting.
         
+        Walks the original string with a cursor instead of re-slicing the
+        remainder, so each character is copied only into its final chunk.
+        
         Args:
             text: Text to split
             max_length: Maximum length of each chunk
@@ -45,49 +117,139 @@ class DiscordManager:
             return [text]
             
         chunks = []
-        remaining_text = text
+        start = 0
+        text_length = len(text)
         
-        while len(remaining_text) > max_length:
-            # Try to find a good split point
-            split_at = max_length
+        while text_length - start > max_length:
+            window_end = start + max_length
+            split_at = window_end
             
             # Look for natural break points in order of preference
-            break_points = [
-                ('\n\n', -2),  # Paragraph breaks
-                ('\n', -1),    # Line breaks
-                ('. ', 0),     # Sentence endings
-                ('! ', 0),     # Exclamation endings
-                ('? ', 0),     # Question endings
-                (', ', 0),     # Comma breaks
-                (' ', 0),      # Word boundaries
-            ]
-            
-            for delimiter, offset in break_points:
-                pos = remaining_text.rfind(delimiter, 0, max_length)
+            for delimiter, offset in _BREAK_POINTS:
+                pos = text.rfind(delimiter, start, window_end)
                 if pos != -1:
                     split_at = pos + len(delimiter) + offset
                     break
             
             # Extract the chunk
-            chunk = remaining_text[:split_at].strip()
+            chunk = text[start:split_at].strip()
             if chunk:
                 chunks.append(chunk)
-                
-            # Prepare remaining text
-            remaining_text = remaining_text[split_at:].lstrip()
             
-            # Safety check to prevent infinite loop
-            if not remaining_text or len(remaining_text) == len(text):
-                break
+            # Skip whitespace at the start of the next chunk
+            start = split_at
+            while start < text_length and text[start].isspace():
+                start += 1
                 
         # Add the final chunk if there's remaining text
-        if remaining_text.strip():
-            chunks.append(remaining_text.strip())
+        final_chunk = text[start:].strip()
+        if final_chunk:
+            chunks.append(final_chunk)
             
         return chunks
     
+    @staticmethod
+    def _rate_limit_delay(headers) -> float:
+        """Work out how long to wait before the next request in the same bucket.
+        
+        Args:
+            headers: Response headers from the Discord API
+            
+        Returns:
+            Seconds to wait, or 0.0 if the bucket still has requests left
+        """
+        if headers.get("X-RateLimit-Remaining") != "0":
+            return 0.0
+        try:
+            return max(float(headers.get("X-RateLimit-Reset-After", 0)), 0.0)
+        except ValueError:
+            return 0.0
+    
+    @staticmethod
+    def _retry_after(headers) -> float:
+        """Read how long Discord wants us to back off after a 429 response.
+        
+        Args:
+            headers: Response headers from the Discord API
+            
+        Returns:
+            Seconds to wait before retrying
+        """
+        for name in ("Retry-After", "X-RateLimit-Reset-After"):
+            try:
+                return max(float(headers[name]), 0.0)
+            except (KeyError, ValueError):
+                continue
+        return 1.0
+    
+    async def _post_chunk(self, session: aiohttp.ClientSession, url: str,
+                          body: bytes) -> Tuple[int, str, float]:
+        """Post one message chunk, pacing sends per channel and retrying 429 responses.
+        
+        Args:
+            session: HTTP session to post with (carries the auth headers)
+            url: Channel messages endpoint
+            body: JSON-encoded message payload
+            
+        Returns:
+            Response status, response body (empty on success), and seconds to
+            wait before the next request in the same rate limit bucket
+        """
+        bucket = self._buckets.get(url)
+        if bucket is None:
+            bucket = self._buckets[url] = _TokenBucket(_CHANNEL_RATE, _CHANNEL_PERIOD)
+        
+        for attempt in range(_RATE_LIMIT_RETRIES + 1):
+            await bucket.acquire()
+            async with session.post(url, data=body) as response:
+                if response.status == 200:
+                    # The body is only needed for errors, but it is still drained so
+                    # aiohttp can return the keep-alive connection to the pool
+                    await response.read()
+                    return response.status, "", self._rate_limit_delay(response.headers)
+                response_text = await response.text()
+                if response.status != 429 or attempt == _RATE_LIMIT_RETRIES:
+                    return response.status, response_text, self._rate_limit_delay(response.headers)
+                retry_after = self._retry_after(response.headers)
+            
+            logging.warning("Discord rate limited the request, retrying in %.2fs", retry_after)
+            await asyncio.sleep(retry_after)
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return the pooled HTTP session, creating it for the running event loop.
+        
+        Reusing one session keeps the TLS connection to discord.com alive
+        between messages. A session belongs to the loop it was created on, so
+        callers that run each send under a fresh ``asyncio.run()`` get a new one.
+        
+        Returns:
+            Shared aiohttp session
+        """
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            # Every request goes to discord.com, so cache its DNS answer between sends
+            self._session = aiohttp.ClientSession(
+                headers=self._headers,
+                connector=aiohttp.TCPConnector(
+                    limit=20,
+                    keepalive_timeout=75,
+                    use_dns_cache=True,
+                    ttl_dns_cache=300,
+                    enable_cleanup_closed=True,
+                )
+            )
+            self._session_loop = loop
+        return self._session
+    
+    async def aclose(self) -> None:
+        """Close the pooled HTTP session, if one is open."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._session_loop = None
+    
     async def send_message_http(self, content: str, channel_id: int, embed: Optional[Dict] = None) -> bool:
-        """Send a Discord message using HTTP API (no persistent connection).
+        """Send a Discord message using the HTTP API (no gateway connection).
         
         Args:
             content: Message content
@@ -97,65 +259,95 @@ class DiscordManager:
         Returns:
             True if successful, False otherwise
         """
-        url = f"https://discord.com/api/v10/channels/{channel_id}/messages"
-        headers = {
-            "Authorization": f"Bot {self.token}",
-            "Content-Type": "application/json"
-        }
+        url = _CHANNEL_MESSAGES_URL(channel_id)
+        # Only build previews and masked headers when they will actually be logged
+        debug = logging.getLogger().isEnabledFor(logging.DEBUG)
         
-        # Log headers with masked token for security
-        masked_headers = {
-            "Authorization": f"Bot {self.token[:20]}...{self.token[-5:]}",
-            "Content-Type": "application/json"
-        }
-        logging.debug(f"Discord API headers: {masked_headers}")
+        if debug:
+            # Log headers with masked token for security
+            masked_headers = {
+                "Authorization": f"Bot {self.token[:20]}...{self.token[-5:]}",
+                "Content-Type": "application/json"
+            }
+            logging.debug("Discord API headers: %s", masked_headers)
         
         # Split long messages into chunks
         chunks = self.split_text_on_word_boundaries(content, 2000)
         
-        logging.info(f"Preparing to send {len(chunks)} Discord message chunk(s) via HTTP to channel {channel_id}")
-        logging.debug(f"Total content length: {len(content)} chars, Split into chunks: {[len(chunk) for chunk in chunks]}")
+        logging.info("Preparing to send %d Discord message chunk(s) via HTTP to channel %s", len(chunks), channel_id)
+        if debug:
+            logging.debug("Total content length: %d chars, Split into chunks: %s",
+                          len(content), [len(chunk) for chunk in chunks])
         
         try:
-            async with aiohttp.ClientSession() as session:
-                success_count = 0
+            session = await self._get_session()
+            success_count = 0
+            
+            for i, chunk in enumerate(chunks):
+                payload = {"content": chunk}
                 
-                for i, chunk in enumerate(chunks):
-                    payload = {"content": chunk}
-                    
-                    # Only add embed to the first message
-                    if i == 0 and embed:
-                        payload["embeds"] = [embed]
-                        logging.debug(f"Adding embed to first chunk: {embed.get('title', 'No title') if embed else 'None'}")
-                    
-                    logging.debug(f"Sending chunk {i+1}/{len(chunks)}: {len(chunk)} chars")
-                    logging.debug(f"Chunk content preview: {chunk[:100]}{'...' if len(chunk) > 100 else ''}")
-                    
-                    async with session.post(url, json=payload, headers=headers) as response:
-                        response_text = await response.text()
-                        
-                        if response.status == 200:
-                            success_count += 1
-                            logging.info(f"Successfully sent Discord chunk {i+1}/{len(chunks)} to channel {channel_id}")
-                        else:
-                            logging.error(f"Discord API error for chunk {i+1}: {response.status} - {response_text}")
-                            return False
-                    
-                    # Rate limiting: small delay between chunks
-                    if i < len(chunks) - 1:  # Don't delay after the last chunk
-                        await asyncio.sleep(0.5)
+                # Only add embed to the first message
+                if i == 0 and embed:
+                    payload["embeds"] = [embed]
+                    logging.debug("Adding embed to first chunk: %s", embed.get('title', 'No title'))
+                
+                if debug:
+                    logging.debug("Sending chunk %d/%d: %d chars", i + 1, len(chunks), len(chunk))
+                    logging.debug("Chunk content preview: %s%s", chunk[:100], '...' if len(chunk) > 100 else '')
                 
-                if success_count == len(chunks):
-                    logging.info(f"Successfully sent all {len(chunks)} chunks to channel {channel_id}")
-                    return True
+                status, response_text, delay = await self._post_chunk(session, url, json_utils.dumps(payload))
+                
+                if status == 200:
+                    success_count += 1
+                    logging.info("Successfully sent Discord chunk %d/%d to channel %s", i + 1, len(chunks), channel_id)
                 else:
-                    logging.error(f"Only {success_count}/{len(chunks)} chunks sent successfully")
+                    logging.error("Discord API error for chunk %d: %s - %s", i + 1, status, response_text)
                     return False
-                    
+                
+                # Chunks must arrive in order, so only wait when Discord says the bucket is empty
+                if delay and i < len(chunks) - 1:  # Don't delay after the last chunk
+                    logging.debug("Discord rate limit bucket exhausted, waiting %.2fs", delay)
+                    await asyncio.sleep(delay)
+            
+            if success_count == len(chunks):
+                logging.info("Successfully sent all %d chunks to channel %s", len(chunks), channel_id)
+                return True
+            else:
+                logging.error("Only %d/%d chunks sent successfully", success_count, len(chunks))
+                return False
+                
         except Exception as e:
-            logging.error(f"Error sending Discord message via HTTP: {e}")
+            logging.error("Error sending Discord message via HTTP: %s", e)
             return False
     
+    @staticmethod
+    def embed_to_dict(embed: "discord.Embed") -> Dict:
+        """Convert a Discord Embed to the dict format used by the HTTP API.
+        
+        When the same embed goes to several channels, convert it once and
+        pass the dict to send_message() instead of the Embed object.
+        
+        Args:
+            embed: Discord embed object
+            
+        Returns:
+            Embed data as dictionary
+        """
+        fields = embed.fields
+        return {
+            "title": embed.title or "",
+            "color": embed.color.value if embed.color else 0x00ff41,
+            "fields": [
+                {
+                    "name": field.name,
+                    "value": field.value,
+                    "inline": field.inline
+                } for field in fields
+            ] if fields else [],
+            "footer": {"text": embed.footer.text} if embed.footer else None,
+            "timestamp": embed.timestamp.isoformat() if embed.timestamp else None
+        }
+    
     async def send_message(self, content: str, channel_id: int, embed=None) -> bool:
         """Send a message to a Discord channel, using client or HTTP based on configuration.
         
@@ -167,8 +359,9 @@ class DiscordManager:
         Returns:
             True if successful, False otherwise
         """
-        logging.info(f"Discord send_message called - Channel: {channel_id}, Content length: {len(content)} chars")
-        logging.debug(f"Content preview: {content[:200]}{'...' if len(content) > 200 else ''}")
+        logging.info("Discord send_message called - Channel: %s, Content length: %d chars", channel_id, len(content))
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug("Content preview: %s%s", content[:200], '...' if len(content) > 200 else '')
         
         # If no client is available or we're in HTTP mode, use HTTP API
         if not self.use_client or not self.client:
@@ -178,20 +371,7 @@ class DiscordManager:
             if embed:
                 if isinstance(embed, discord.Embed):
                     logging.debug("Converting Discord Embed object to dict for HTTP API")
-                    # Convert Discord Embed to dict format for HTTP API
-                    embed_dict = {
-                        "title": embed.title or "",
-                        "color": embed.color.value if embed.color else 0x00ff41,
-                        "fields": [
-                            {
-                                "name": field.name,
-                                "value": field.value,
-                                "inline": field.inline
-                            } for field in embed.fields
-                        ],
-                        "footer": {"text": embed.footer.text} if embed.footer else None,
-                        "timestamp": embed.timestamp.isoformat() if embed.timestamp else None
-                    }
+                    embed_dict = self.embed_to_dict(embed)
                 elif isinstance(embed, dict):
                     embed_dict = embed
             
@@ -199,7 +379,8 @@ class DiscordManager:
         
         # Use client-based approach (original implementation)
         try:
-            channel = await self.client.fetch_channel(channel_id)
+            # Prefer the gateway cache and only hit the REST API on a cold cache
+            channel = self.client.get_channel(channel_id) or await self.client.fetch_channel(channel_id)
             
             if embed:
                 # Convert dict embed to Discord Embed object if needed
@@ -230,11 +411,11 @@ class DiscordManager:
                 for chunk in self.split_text_on_word_boundaries(content):
                     await channel.send(chunk)
                     
-            logging.info(f"Sent message to Discord channel {channel_id} via client.")
+            logging.info("Sent message to Discord channel %s via client.", channel_id)
             return True
             
         except Exception as e:
-            logging.error(f"Discord send error (client mode): {e}")
+            logging.error("Discord send error (client mode): %s", e)
             return False
     
     def run(self):
@@ -4,12 +4,59 @@ This module handles IP monitoring operations including checks, configuration,
 Discord notifications, and history tracking.
 Following PEP 257 for docstring conventions.
 """
+import asyncio
+import ipaddress
 import os
 import logging
-import requests
-from typing import Optional, Dict, List
-from datetime import datetime
-import json
+import shutil
+import tempfile
+import aiohttp
+from typing import Callable, Optional, Dict, List, Tuple, Union
+from datetime import datetime, timezone
+from . import json_utils
+
+# Per-request timeout for external IP lookup services
+_IP_CHECK_TIMEOUT = aiohttp.ClientTimeout(total=10)
+
+# config.json in the project root, used when the config manager doesn't say where it lives
+_DEFAULT_CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'config.json')
+
+# External IP lookup services, queried in parallel; the first usable answer wins.
+# api.ipify.org answers over IPv4 only, the others over whichever protocol the
+# connection used, so answers are checked against the last known address family.
+_IP_SERVICES = (
+    "https://api.ipify.org?format=json",
+    "https://httpbin.org/ip",
+    "https://jsonip.com",
+)
+
+# Static parts of the IP change embed; only the field values and timestamp vary
+_IP_CHANGE_EMBED = {
+    "title": "🌐 External IP Address Changed",
+    "color": 0x00ff41,  # ARK green
+    "footer": {
+        "text": "ARK FunnyCommentator IP Monitor"
+    },
+}
+# (name, inline) for each embed field, in display order
+_IP_CHANGE_FIELDS = (("Previous IP", True), ("New IP", True), ("Detected At", False))
+
+
+def _parse_ip(value) -> Optional[Union[ipaddress.IPv4Address, ipaddress.IPv6Address]]:
+    """Parse an IP address reported by a lookup service.
+    
+    Args:
+        value: Reported address, or None
+        
+    Returns:
+        The parsed address, or None if the value isn't a single valid IP
+    """
+    if not isinstance(value, str):
+        return None
+    try:
+        return ipaddress.ip_address(value.strip())
+    except ValueError:
+        return None
 
 
 class IPMonitorManager:
@@ -26,53 +73,105 @@ class IPMonitorManager:
         self.config_manager = config_manager
         self.database = database_manager
         self.discord = discord_manager
+        # HTTP-mode DiscordManager built on first use when none was injected
+        self._discord_http = None
         self.logger = logging.getLogger(__name__)
+        # Parsed config file, reused until the file's mtime changes
+        self._config_cache: Optional[Dict] = None
+        self._config_cache_key: Optional[tuple] = None
+        # The config manager never changes type, so pick how to read it once
+        self._get_config_impl: Callable[[], Dict] = self._resolve_config_strategy()
     
-    def get_config(self) -> Dict:
-        """Get configuration as dictionary.
+    def _config_file_path(self) -> str:
+        """Return the path of the JSON config file backing this manager."""
+        if hasattr(self.config_manager, '_get_config_path'):
+            # If it's a web app config manager
+            return self.config_manager._get_config_path()
+        return _DEFAULT_CONFIG_PATH
+    
+    def _load_config_file(self, config_path: str) -> Dict:
+        """Load a JSON config file, reusing the last parse while the file is unchanged.
+        
+        Callers may edit the returned dict, but must persist edits through
+        save_config() so the cache and the file stay in step.
         
+        Args:
+            config_path: Path to the config file
+            
         Returns:
             Configuration dictionary
         """
-        if hasattr(self.config_manager, 'discord_token'):
-            # Web app Config object with direct attributes - build dict representation
-            config_dict = {
-                "discord": {
-                    "token": getattr(self.config_manager, 'discord_token', ''),
-                    "channel_id_server_status": getattr(self.config_manager, 'channel_id_server_status', 0)
-                },
-                "database": {
-                    "path": getattr(self.config_manager, 'db_path', 'arkbot_memory.db')
-                },
-                "ip_monitor": {
-                    "check_interval_seconds": getattr(self.config_manager, 'ip_retry_seconds', 1800),
-                    "last_known_ip": getattr(self.config_manager, 'previous_ip', None),
-                    "discord_notifications": True,  # Default value
-                    "history_retention_days": 30    # Default value
-                }
-            }
-            return config_dict
-        elif hasattr(self.config_manager, 'config'):
+        stat = os.stat(config_path)
+        cache_key = (config_path, stat.st_mtime_ns, stat.st_size)
+        if self._config_cache is None or self._config_cache_key != cache_key:
+            with open(config_path, 'rb') as f:
+                self._config_cache = json_utils.loads(f.read())
+            self._config_cache_key = cache_key
+        return self._config_cache
+    
+    def _resolve_config_strategy(self) -> Callable[[], Dict]:
+        """Choose how get_config() reads configuration from the config manager.
+        
+        Returns:
+            Callable returning the configuration dictionary
+        """
+        config_manager = self.config_manager
+        if hasattr(config_manager, 'discord_token'):
+            # Web app Config object with direct attributes
+            return self._config_from_attrs
+        elif hasattr(config_manager, 'config'):
             # Main app Config object with a config attribute
-            return self.config_manager.config
-        elif hasattr(self.config_manager, '_get_config_path'):
+            return lambda: config_manager.config
+        elif hasattr(config_manager, '_get_config_path'):
             # If it's a web app config manager, load JSON directly
-            import json
-            config_path = self.config_manager._get_config_path()
-            with open(config_path, 'r') as f:
-                return json.load(f)
-        elif isinstance(self.config_manager, dict):
+            return lambda: self._load_config_file(config_manager._get_config_path())
+        elif isinstance(config_manager, dict):
             # If it's already a dictionary
-            return self.config_manager
+            return lambda: config_manager
         else:
-            # Fallback: try to load from config.json directly
-            try:
-                config_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'config.json')
-                with open(config_path, 'r') as f:
-                    return json.load(f)
-            except Exception as e:
-                self.logger.error(f"Failed to load config: {e}")
-                return {}
+            return self._config_from_default_path
+    
+    def _config_from_attrs(self) -> Dict:
+        """Build a config dict from a Config object with direct attributes.
+        
+        Returns:
+            Configuration dictionary
+        """
+        return {
+            "discord": {
+                "token": getattr(self.config_manager, 'discord_token', ''),
+                "channel_id_server_status": getattr(self.config_manager, 'channel_id_server_status', 0)
+            },
+            "database": {
+                "path": getattr(self.config_manager, 'db_path', 'arkbot_memory.db')
+            },
+            "ip_monitor": {
+                "check_interval_seconds": getattr(self.config_manager, 'ip_retry_seconds', 1800),
+                "last_known_ip": getattr(self.config_manager, 'previous_ip', None),
+                "discord_notifications": True,  # Default value
+                "history_retention_days": 30    # Default value
+            }
+        }
+    
+    def _config_from_default_path(self) -> Dict:
+        """Load config.json from the project root.
+        
+        Returns:
+            Configuration dictionary, or an empty dict if it can't be read
+        """
+        try:
+            return self._load_config_file(_DEFAULT_CONFIG_PATH)
+        except Exception as e:
+            self.logger.error(f"Failed to load config: {e}")
+            return {}
+    
+    def get_config(self) -> Dict:
+        """Get configuration as dictionary.
+        
+        Returns:
+            Configuration dictionary
+        """
+        return self._get_config_impl()
     
     def save_config(self, config_data: Dict) -> None:
         """Save configuration to file.
@@ -81,16 +180,36 @@ class IPMonitorManager:
             config_data: Configuration dictionary to save
         """
         try:
-            if hasattr(self.config_manager, '_get_config_path'):
-                # If it's a web app config manager
-                config_path = self.config_manager._get_config_path()
-            else:
-                # Default path
-                config_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'config.json')
-            
-            with open(config_path, 'w') as f:
-                json.dump(config_data, f, indent=4)
+            config_path = self._config_file_path()
+            # Write a uniquely named temp file and rename it over the config, so a
+            # crash mid-write never leaves a truncated config.json behind and the
+            # bot and web app never write into each other's temp file
+            fd, tmp_path = tempfile.mkstemp(
+                dir=os.path.dirname(os.path.abspath(config_path)),
+                prefix=os.path.basename(config_path) + ".",
+                suffix=".tmp"
+            )
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(json_utils.dumps_config(config_data))
+                    f.flush()
+                    os.fsync(f.fileno())
+                # mkstemp creates the file owner-only; keep the permissions the
+                # config already had so the rename doesn't change them
+                if os.path.exists(config_path):
+                    shutil.copymode(config_path, tmp_path)
+                os.replace(tmp_path, config_path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+            # What was just written is the new cached parse
+            stat = os.stat(config_path)
+            self._config_cache = config_data
+            self._config_cache_key = (config_path, stat.st_mtime_ns, stat.st_size)
         except Exception as e:
+            self._config_cache = None
+            self._config_cache_key = None
             self.logger.error(f"Failed to save config: {e}")
             raise
     
@@ -101,28 +220,44 @@ class IPMonitorManager:
             Current IP address if successful, None otherwise
         """
         try:
-            # Try multiple IP services for reliability
-            services = [
-                "https://api.ipify.org?format=json",
-                "https://httpbin.org/ip",
-                "https://jsonip.com"
-            ]
+            # Keep reporting the same address family as last time, so a dual-stack
+            # host doesn't flip between its IPv4 and IPv6 address between checks
+            preferred_version = None
+            last_known = _parse_ip(self.get_last_known_ip())
+            if last_known is not None:
+                preferred_version = last_known.version
             
-            for service in services:
+            # Query every service at once and take the first usable answer; the
+            # family check above is what keeps the reported address stable
+            async with aiohttp.ClientSession(timeout=_IP_CHECK_TIMEOUT) as session:
+                tasks = [
+                    asyncio.ensure_future(self._lookup_ip(session, service))
+                    for service in _IP_SERVICES
+                ]
+                fallback = None
                 try:
-                    response = requests.get(service, timeout=10)
-                    if response.status_code == 200:
-                        data = response.json()
-                        # Handle different response formats
-                        if 'ip' in data:
-                            return data['ip']
-                        elif 'origin' in data:
-                            return data['origin']
-                        elif 'ip' in str(data):
-                            return str(data).split('"')[3]  # Simple parsing for jsonip
-                except Exception as e:
-                    self.logger.warning(f"Failed to get IP from {service}: {e}")
-                    continue
+                    for next_answer in asyncio.as_completed(tasks):
+                        service, answer, error = await next_answer
+                        if error is not None:
+                            self.logger.warning(f"Failed to get IP from {service}: {error}")
+                            continue
+                        address = _parse_ip(answer)
+                        if address is None:
+                            self.logger.warning(f"No usable IP address from {service}")
+                        elif preferred_version is None or address.version == preferred_version:
+                            return str(address)
+                        elif fallback is None:
+                            fallback = str(address)
+                finally:
+                    # Stop the lookups still running before their session is closed
+                    for task in tasks:
+                        task.cancel()
+                    await asyncio.gather(*tasks, return_exceptions=True)
+            
+            if fallback:
+                # Only the other address family is reachable now, which is a real change
+                self.logger.warning(f"No IPv{preferred_version} answer from any service, using {fallback}")
+                return fallback
             
             self.logger.error("All IP services failed")
             return None
@@ -131,6 +266,43 @@ class IPMonitorManager:
             self.logger.error(f"Error checking current IP: {e}")
             return None
     
+    @classmethod
+    async def _lookup_ip(cls, session: aiohttp.ClientSession,
+                         service: str) -> Tuple[str, Optional[str], Optional[Exception]]:
+        """Query one lookup service, reporting failures instead of raising them.
+        
+        Args:
+            session: HTTP session to query with
+            service: Lookup service URL
+            
+        Returns:
+            The service URL, its answer, and the error if the query failed
+        """
+        try:
+            return service, await cls._query_ip_service(session, service), None
+        except Exception as e:
+            return service, None, e
+    
+    @staticmethod
+    async def _query_ip_service(session: aiohttp.ClientSession, service: str) -> Optional[str]:
+        """Ask one lookup service for the external IP address.
+        
+        Args:
+            session: HTTP session to query with
+            service: Lookup service URL
+            
+        Returns:
+            IP address reported by the service, or None if it gave no answer
+        """
+        async with session.get(service) as response:
+            if response.status != 200:
+                return None
+            data = await response.json(content_type=None)
+            if not isinstance(data, dict):
+                return None
+            # ipify and jsonip answer with "ip", httpbin with "origin"
+            return data.get('ip') or data.get('origin')
+    
     def get_last_known_ip(self) -> Optional[str]:
         """Get last known IP from configuration.
         
@@ -155,14 +327,11 @@ class IPMonitorManager:
             True if successful, False otherwise
         """
         try:
-            old_ip = self.get_last_known_ip()
-            
-            # Update configuration
+            # Read the old IP and update it in one load/save round trip
             config = self.get_config()
-            if 'ip_monitor' not in config:
-                config['ip_monitor'] = {}
-            
-            config['ip_monitor']['last_known_ip'] = new_ip
+            ip_monitor = config.setdefault('ip_monitor', {})
+            old_ip = ip_monitor.get('last_known_ip')
+            ip_monitor['last_known_ip'] = new_ip
             self.save_config(config)
             
             # Log the change in database
@@ -207,43 +376,30 @@ class IPMonitorManager:
                 self.logger.warning("No Discord channel or token configured for server status")
                 return False
             
-            # Create Discord embed message
-            embed = {
-                "title": "🌐 External IP Address Changed",
-                "color": 0x00ff41,  # ARK green
-                "fields": [
-                    {
-                        "name": "Previous IP",
-                        "value": f"`{old_ip or 'Unknown'}`",
-                        "inline": True
-                    },
-                    {
-                        "name": "New IP", 
-                        "value": f"`{new_ip}`",
-                        "inline": True
-                    },
-                    {
-                        "name": "Detected At",
-                        "value": f"<t:{int(datetime.now().timestamp())}:F>",
-                        "inline": False
-                    }
-                ],
-                "footer": {
-                    "text": "ARK FunnyCommentator IP Monitor"
-                },
-                "timestamp": datetime.utcnow().isoformat()
-            }
+            # Create Discord embed message from the shared template
+            now = datetime.now(timezone.utc)
+            values = (f"`{old_ip or 'Unknown'}`", f"`{new_ip}`", f"<t:{int(now.timestamp())}:F>")
+            embed = dict(_IP_CHANGE_EMBED)
+            embed["fields"] = [
+                {"name": name, "value": value, "inline": inline}
+                for (name, inline), value in zip(_IP_CHANGE_FIELDS, values)
+            ]
+            embed["timestamp"] = now.isoformat()
             
             message = f"🔄 **IP Address Update**\nExternal IP has changed from `{old_ip}` to `{new_ip}`"
             
-            # Use enhanced DiscordManager HTTP mode instead of Discord client
-            from .discord_manager import DiscordManager
-            discord_manager = DiscordManager(discord_token, use_client=False)
-            success = await discord_manager.send_message(
-                content=message,
-                channel_id=channel_id,
-                embed=embed
-            )
+            discord_manager = self._get_discord_http(discord_token)
+            try:
+                success = await discord_manager.send_message(
+                    content=message,
+                    channel_id=channel_id,
+                    embed=embed
+                )
+            finally:
+                if discord_manager is not self.discord:
+                    # Nothing else owns this manager's session; callers without an
+                    # injected manager run each check under their own event loop
+                    await discord_manager.aclose()
             
             if success:
                 self.logger.info(f"Discord notification sent for IP change: {old_ip} → {new_ip}")
@@ -256,6 +412,26 @@ class IPMonitorManager:
             self.logger.error(f"Error sending Discord IP change notification: {e}")
             return False
     
+    def _get_discord_http(self, discord_token: str):
+        """Return an HTTP-mode DiscordManager for IP change notifications.
+        
+        The injected manager is reused when it sends over HTTP with the same
+        token; otherwise one is built on first use and kept for later calls.
+        
+        Args:
+            discord_token: Bot token from the configuration
+            
+        Returns:
+            DiscordManager to send the notification with
+        """
+        if (self.discord is not None and not getattr(self.discord, 'use_client', True)
+                and getattr(self.discord, 'token', None) == discord_token):
+            return self.discord
+        if self._discord_http is None or self._discord_http.token != discord_token:
+            from .discord_manager import DiscordManager
+            self._discord_http = DiscordManager(discord_token, use_client=False)
+        return self._discord_http
+    
     def get_monitor_config(self) -> Dict:
         """Get current IP monitor configuration.
         
@@ -287,9 +463,7 @@ class IPMonitorManager:
         """
         try:
             config = self.get_config()
-            
-            if 'ip_monitor' not in config:
-                config['ip_monitor'] = {}
+            ip_monitor = config.setdefault('ip_monitor', {})
             
             # Update allowed configuration fields
             allowed_fields = [
@@ -300,7 +474,7 @@ class IPMonitorManager:
             
             for field in allowed_fields:
                 if field in new_config:
-                    config['ip_monitor'][field] = new_config[field]
+                    ip_monitor[field] = new_config[field]
             
             self.save_config(config)
             self.logger.info(f"IP monitor configuration updated: {new_config}")
@@ -0,0 +1,59 @@
+"""JSON serialisation helpers.
+
+This module wraps the optional orjson dependency so every component encodes
+and decodes JSON the same way, falling back to the standard library when
+orjson isn't installed.
+Following PEP 257 for docstring conventions.
+"""
+import json
+from typing import Any
+
+try:
+    import orjson  # Optional: faster JSON parsing and serialisation
+except ImportError:
+    orjson = None
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serialise to UTF-8 JSON bytes, using orjson when it is installed.
+    
+    Args:
+        obj: Object to serialise
+        indent: Pretty-print with two-space indentation
+    
+    Returns:
+        Encoded JSON document
+    """
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None)
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode("utf-8")
+
+
+def loads(data: bytes) -> Any:
+    """Parse JSON bytes or text, using orjson when it is installed.
+    
+    Args:
+        data: Encoded JSON document
+    
+    Returns:
+        Decoded object
+    """
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+def dumps_config(config: Any) -> bytes:
+    """Serialise config.json content in the layout every writer shares.
+    
+    The web app edits config.json with ``json.dump(..., indent=4)``, and
+    orjson can only indent by two spaces, so this always uses the standard
+    library to keep the file's layout stable whichever component saved it.
+    
+    Args:
+        config: Configuration dictionary
+    
+    Returns:
+        Encoded JSON document
+    """
+    return json.dumps(config, indent=4).encode("utf-8")
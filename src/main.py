@@ -6,12 +6,14 @@ Following PEP 257 for docstring conventions.
 import asyncio
 import json
 import logging
+import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 
-from src.config import Config
+from src.config import get_config
 from src.database import DatabaseManager
 from src.rcon_client import RconClient
 from src.discord_manager import DiscordManager
@@ -27,7 +29,7 @@ class Application:
     
     def __init__(self):
         """Initialize application and its components."""
-        self.config = Config()
+        self.config = get_config()
         
         # Initialize log management first (before logging setup)
         self.log_manager = LogManager(
@@ -92,6 +94,10 @@ class Application:
         
         self.stop_event = asyncio.Event()
         self.scheduler = AsyncIOScheduler()
+        
+        # Dedicated workers for Ollama calls so long generations never queue
+        # behind (or starve) the default executor used for RCON and DB work
+        self.ai_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="ai")
     
     def setup_logging(self):
         """Set up application logging."""
@@ -304,7 +310,8 @@ class Application:
             logging.debug(f"Context for cluster {cluster_name}: {len(combined_context)} chars")
             
             # Generate cluster summary
-            cluster_summary = await asyncio.to_thread(
+            cluster_summary = await asyncio.get_running_loop().run_in_executor(
+                self.ai_executor,
                 self.ollama.get_funny_summary,
                 all_lines,
                 combined_context
@@ -445,7 +452,8 @@ class Application:
             logging.debug(f"Context for server {server_name}: {len(final_context)} chars")
             
             # Generate summary with server-specific context
-            summary = await asyncio.to_thread(
+            summary = await asyncio.get_running_loop().run_in_executor(
+                self.ai_executor,
                 self.ollama.get_funny_summary,
                 lines,
                 final_context
@@ -495,7 +503,9 @@ class Application:
         try:
             # Ensure Ollama is running before processing
             # Run this in a thread since it involves network and process operations
-            is_running = await asyncio.to_thread(self.ollama.ensure_server_running, "Hi")
+            is_running = await asyncio.get_running_loop().run_in_executor(
+                self.ai_executor, self.ollama.ensure_server_running, "Hi"
+            )
             if not is_running:
                 logging.error("Skipping RCON summary job - Ollama server not available")
                 return
@@ -672,6 +682,10 @@ class Application:
                 except Exception as e:
                     logging.error(f"Error stopping Ollama: {e}")
 
+            # Release the AI worker threads
+            if hasattr(self, 'ai_executor'):
+                self.ai_executor.shutdown(wait=False, cancel_futures=True)
+
             # Close RCON connections
             if hasattr(self, 'rcon_clients'):
                 for name, client in self.rcon_clients.items():
@@ -681,7 +695,12 @@ class Application:
                     except Exception as e:
                         logging.error(f"Error closing RCON client {name}: {e}")
 
-            # Note: No Discord client cleanup needed in HTTP-only mode
+            # Close the pooled Discord HTTP session
+            if hasattr(self, 'discord') and self.discord:
+                try:
+                    await self.discord.aclose()
+                except Exception as e:
+                    logging.error(f"Error closing Discord HTTP session: {e}")
 
             # Close database connections
             if hasattr(self, 'db') and self.db:
@@ -771,6 +790,15 @@ class Application:
 
 def main():
     """Application entry point."""
+    # Match run.py: use uvloop on Unix-like systems if available
+    if sys.platform != "win32":
+        try:
+            import uvloop
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+            logging.info("Using uvloop event loop")
+        except ImportError:
+            logging.debug("uvloop not available, using default event loop")
+    
     app = Application()
     try:
         asyncio.run(app.run())
@@ -5,12 +5,55 @@ server and generating summaries. Uses configurable context window size (num_ctx)
 limit memory usage while allowing large models to run on constrained hardware.
 Following PEP 257 for docstring conventions.
 """
+import json
 import logging
+import re
+import shlex
 import subprocess
+import sys
 import requests
 from typing import List
 import time
-import tiktoken
+
+_IS_WINDOWS = sys.platform == "win32"
+
+# Delays in seconds between startup probes; the last one repeats until the timeout
+_STARTUP_BACKOFF = (0.5, 1, 2, 4, 8, 16)
+
+def _startup_backoff():
+    """Yield exponentially growing delays between Ollama startup probes."""
+    yield from _STARTUP_BACKOFF
+    while True:
+        yield _STARTUP_BACKOFF[-1]
+
+# ARK game log timestamp prefix, e.g. "2024.01.31_18.05.12: "
+_LOG_TIMESTAMP_RE = re.compile(r'^\d{4}\.\d{2}\.\d{2}_\d{2}\.\d{2}\.\d{2}:\s*')
+
+def condense_log_lines(log_lines: List[str]) -> List[str]:
+    """Collapse repeated log events into a single line with a count.
+    
+    Lines are compared without their timestamp so repeated events spread over
+    the day still collapse. Order of first occurrence is preserved.
+    
+    Args:
+        log_lines: Sanitized log lines
+        
+    Returns:
+        Deduplicated lines, repeated events suffixed with "(×N)"
+    """
+    first_seen = {}
+    counts = {}
+    for line in log_lines:
+        event = _LOG_TIMESTAMP_RE.sub('', line)
+        if event in counts:
+            counts[event] += 1
+        else:
+            counts[event] = 1
+            first_seen[event] = line
+    return [
+        f"{first_seen[event]} (×{count})" if count > 1 else first_seen[event]
+        for event, count in counts.items()
+    ]
 
 class OllamaManager:
     def __init__(self, url: str, model: str, start_cmd: str, timeout: int, 
@@ -19,6 +62,8 @@ class OllamaManager:
                  safety_buffer: int = 48, tokenizer_model: str = "gpt-3.5-turbo",
                  enable_reasoning: bool = False):
         self.url = url
+        # Model listing endpoint on the same server, used as a cheap liveness probe
+        self.tags_url = url.split('/api/', 1)[0].rstrip('/') + '/api/tags'
         self.model = model
         self.start_cmd = start_cmd
         self.timeout = timeout
@@ -31,8 +76,9 @@ class OllamaManager:
         self.enable_reasoning = enable_reasoning
         self._shutdown_requested = False
         
-        # Initialize tiktoken encoder
+        # Initialize tiktoken encoder (imported lazily, it loads large BPE tables)
         try:
+            import tiktoken
             self.tokenizer = tiktoken.encoding_for_model(tokenizer_model)
             logging.info(f"Using tiktoken with model '{tokenizer_model}' for token counting")
         except Exception as e:
@@ -110,12 +156,30 @@ class OllamaManager:
         
         return result
 
-    def ensure_server_running(self, initial_prompt: str) -> bool:
-        """Ensure Ollama server is running and start if needed."""
-        self._shutdown_requested = False
+    def _is_server_alive(self) -> bool:
+        """Check whether the Ollama server is accepting requests.
         
+        Uses the lightweight model listing endpoint so no generation is triggered.
+        
+        Returns:
+            True if the server answered with HTTP 200, False otherwise
+        """
+        try:
+            return self.session.get(self.tags_url, timeout=2).status_code == 200
+        except Exception as e:
+            logging.debug(f"Ollama liveness check failed: {e}")
+            return False
+
+    def _prime_model(self, initial_prompt: str) -> bool:
+        """Send a single generation request so the model is loaded before use.
+        
+        Args:
+            initial_prompt: Prompt used to warm up the model
+            
+        Returns:
+            True if the model answered with HTTP 200, False otherwise
+        """
         try:
-            # First try to connect to existing server
             resp = self.session.post(
                 self.url,
                 json={
@@ -127,49 +191,55 @@ class OllamaManager:
                 timeout=self.startup_timeout
             )
             if resp.status_code == 200:
-                logging.info("Ollama AI server is already running.")
                 return True
-            else:
-                logging.warning(f"Ollama server responded with status {resp.status_code}: {resp.text}")
+            logging.warning(f"Ollama model warm-up failed - HTTP {resp.status_code}: {resp.text[:200]}")
         except Exception as e:
-            logging.info(f"Ollama AI server not running or not responding: {e}")
+            logging.warning(f"Ollama model warm-up error: {e}")
+        return False
+
+    def ensure_server_running(self, initial_prompt: str) -> bool:
+        """Ensure Ollama server is running and start if needed."""
+        self._shutdown_requested = False
+        
+        # First check for an existing server
+        if self._is_server_alive():
+            logging.info("Ollama AI server is already running.")
+            return self._prime_model(initial_prompt)
+        logging.info("Ollama AI server not running or not responding")
 
         # Start Ollama as a subprocess if not running
         try:
             logging.info("Starting Ollama AI server...")
+            popen_kwargs = {}
+            if _IS_WINDOWS:
+                # Windows Popen takes the command line as-is, so quoted paths work
+                # without a shell and without re-quoting
+                popen_kwargs["creationflags"] = subprocess.CREATE_NO_WINDOW
+                args = self.start_cmd
+            else:
+                args = shlex.split(self.start_cmd)
             subprocess.Popen(
-                self.start_cmd, 
-                shell=True,
-                creationflags=subprocess.CREATE_NO_WINDOW
+                args,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                **popen_kwargs
             )
             
-            # Wait for server to become available
-            start_time = time.time()
-            while time.time() - start_time < self.startup_timeout:
+            # Wait for server to become available, backing off between probes
+            deadline = time.monotonic() + self.startup_timeout
+            for delay in _startup_backoff():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                time.sleep(min(delay, remaining))
+                
                 if self._shutdown_requested:
                     logging.info("Startup cancelled - shutdown requested")
                     return False
                     
-                try:
-                    resp = self.session.post(
-                        self.url,
-                        json={
-                            "model": self.model, 
-                            "prompt": initial_prompt, 
-                            "stream": False,
-                            "options": {}  # Minimal options for startup check
-                        },
-                        timeout=self.startup_timeout/2
-                    )
-                    if resp.status_code == 200:
-                        logging.info("Ollama AI server started successfully.")
-                        return True
-                    else:
-                        logging.warning(f"Ollama startup check failed - HTTP {resp.status_code}: {resp.text[:200]}")
-                except Exception as e:
-                    logging.warning(f"Ollama startup check error: {e}")
-                    time.sleep(2)
-                    continue
+                if self._is_server_alive():
+                    logging.info("Ollama AI server started successfully.")
+                    return self._prime_model(initial_prompt)
                     
             logging.error("Failed to start Ollama AI server within timeout.")
             return False
@@ -185,27 +255,26 @@ class OllamaManager:
         try:
             # First try to stop the model gracefully
             subprocess.run(
-                f'ollama stop {self.model}',
-                shell=True,
+                ['ollama', 'stop', self.model],
                 check=False,
-                capture_output=True,
-                text=True
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL
             )
             logging.info(f"Ollama model {self.model} stopped successfully.")
             
             # Then forcefully terminate the process on Windows
-            result = subprocess.run(
-                'taskkill /F /IM ollama.exe',
-                shell=True,
-                check=False,
-                capture_output=True,
-                text=True
-            )
-            # Only log if there were actual processes to terminate
-            if result.returncode == 0:
-                logging.info("Ollama server terminated.")
-            else:
-                logging.debug("No Ollama processes found to terminate.")
+            if _IS_WINDOWS:
+                result = subprocess.run(
+                    ['taskkill', '/F', '/IM', 'ollama.exe'],
+                    check=False,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL
+                )
+                # Only log if there were actual processes to terminate
+                if result.returncode == 0:
+                    logging.info("Ollama server terminated.")
+                else:
+                    logging.debug("No Ollama processes found to terminate.")
             
         except Exception as e:
             logging.error(f"Error stopping Ollama: {e}")
@@ -220,11 +289,16 @@ class OllamaManager:
             logging.info(f"Starting AI summary generation for {len(log_lines)} log lines")
             logging.debug(f"Using Ollama model: {self.model} with context window limited to {self.input_token_size} tokens")
             
+            # Repeated events only cost prompt tokens, so send each one once with a count
+            condensed_lines = condense_log_lines(log_lines)
+            if len(condensed_lines) < len(log_lines):
+                logging.debug(f"Condensed {len(log_lines)} log lines to {len(condensed_lines)} unique events")
+            
             # Create final prompt with events at the end for optimal ordering
-            if log_lines:
+            if condensed_lines:
                 events_section = (
                     "\n=== CURRENT EVENTS TO SUMMARIZE ===\n" + 
-                    "\n".join(log_lines) + 
+                    "\n".join(condensed_lines) + 
                     "\n=== END OF CURRENT EVENTS ===\n" + 
                     "\nIMPORTANT: Focus your commentary on the CURRENT EVENTS above. Use any historical context only to avoid repetition, not as the main topic. And stop repeating the phrase 'but hey'."
                 )
@@ -259,7 +333,7 @@ class OllamaManager:
             request_payload = {
                 "model": self.model,
                 "prompt": full_prompt,
-                "stream": False,
+                "stream": True,
                 "options": options
             }
             
@@ -271,17 +345,36 @@ class OllamaManager:
             logging.debug(f"Prompt : {repr(full_prompt)}")
             logging.debug(f"Request payload options: {request_payload['options']}")
             
-            response = self.session.post(
+            # Stream the generation so tokens are consumed as Ollama produces them
+            # instead of waiting for the server to buffer the whole response.
+            # With stream=True the requests timeout only bounds each read, so the
+            # overall ai.timeout_seconds limit is enforced with a deadline here
+            response_parts = []
+            raw_json = {}
+            deadline = time.monotonic() + self.timeout
+            with self.session.post(
                 self.url,
                 json=request_payload,
-                timeout=self.timeout
-            )
+                timeout=self.timeout,
+                stream=True
+            ) as response:
+                logging.debug(f"Ollama API response status: {response.status_code}")
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    raw_json = json.loads(line)
+                    if "error" in raw_json:
+                        raise RuntimeError(raw_json["error"])
+                    response_parts.append(raw_json.get("response", ""))
+                    if raw_json.get("done"):
+                        break
+                    if time.monotonic() > deadline:
+                        # Leaving the block closes the connection, which stops the generation
+                        raise TimeoutError(f"Ollama generation exceeded {self.timeout}s")
             
-            logging.debug(f"Ollama API response status: {response.status_code}")
-            response.raise_for_status()
-            raw_json = response.json()
-            logging.debug(f"Full Ollama response JSON keys: {list(raw_json.keys())}")
-            logging.debug(f"Raw response field: {repr(raw_json.get('response', 'MISSING'))}")
+            # The final streamed object carries the generation statistics
+            logging.debug(f"Final Ollama response JSON keys: {list(raw_json.keys())}")
             
             # Critical diagnostic information
             logging.debug(f"Response done: {raw_json.get('done', 'MISSING')}")
@@ -290,7 +383,7 @@ class OllamaManager:
             logging.debug(f"Eval count (output tokens): {raw_json.get('eval_count', 'MISSING')}")
             logging.debug(f"Total duration: {raw_json.get('total_duration', 'MISSING')} ns")
             
-            raw_response = raw_json["response"].strip()
+            raw_response = "".join(response_parts).strip()
             
             # # Handle DeepSeek-R1 thinking tokens - extract content after </think>
             # if "<think>" in raw_response and "</think>" in raw_response:
@@ -3,13 +3,18 @@
 This module handles all RCON-related operations including fetching game logs
 and sanitizing them. Following PEP 257 for docstring conventions.
 """
-import socket
 import logging
 import re
 from typing import List
-from rcon.source import Client
 from contextlib import contextmanager
 
+# Control characters to strip from log lines (newlines and tabs are kept)
+_SANITIZE_RE = re.compile(r'[^\x09\x0A\x0D\x20-\x7E\u00A0-\uFFFF]')
+_MAX_LINE_LENGTH = 500
+
+# Seconds to wait on the RCON socket before giving up
+_RCON_TIMEOUT = 10
+
 class RconClient:
     """RCON client for interacting with game servers."""
     
@@ -34,18 +39,18 @@ class RconClient:
         Yields:
             An RCON client connection
         """
-        # Use socket timeout like in the working old script
-        socket.setdefaulttimeout(10)
+        # Imported here so the rcon package is only loaded once a connection is made
+        from rcon.source import Client
+        
         try:
-            # Use the same pattern as the working old script - let the context manager handle connection
-            with Client(self.host, self.port, passwd=self.password) as client:
+            # Let the context manager handle the connection; the timeout applies
+            # to this socket only instead of the process-wide default
+            with Client(self.host, self.port, timeout=_RCON_TIMEOUT, passwd=self.password) as client:
                 logging.debug(f"RCON connected to {self.host}:{self.port}")
                 yield client
         except Exception as e:
             logging.error(f"RCON connection failed to {self.host}:{self.port}: {e}")
             raise
-        finally:
-            socket.setdefaulttimeout(None)
     
     @staticmethod
     def sanitize_log_line(line: str) -> str:
@@ -58,11 +63,11 @@ class RconClient:
             Sanitized log line
         """
         # Remove control characters except newlines and tabs
-        line = re.sub(r'[^\x09\x0A\x0D\x20-\x7E\u00A0-\uFFFF]', '', line)
+        line = _SANITIZE_RE.sub('', line)
         # Strip excessive whitespace
         line = line.strip()
         # Limit length per line
-        return line[:500]
+        return line[:_MAX_LINE_LENGTH]
     
     def fetch_logs(self) -> List[str]:
         """Fetch and sanitize logs from the RCON server or log file.
@@ -92,9 +97,11 @@ class RconClient:
                 if not logs:
                     raise Exception("No data returned from GetGameLog command")
                 
-                lines = logs.splitlines()
-                # Sanitize each line
-                lines = [self.sanitize_log_line(line) for line in lines if line.strip()]
+                # Strip control characters from the whole buffer in one regex pass,
+                # then trim and cap each line
+                cleaned = _SANITIZE_RE.sub('', logs)
+                lines = [line.strip()[:_MAX_LINE_LENGTH] for line in cleaned.splitlines()]
+                lines = [line for line in lines if line]
                 logging.info(f"Successfully fetched {len(lines)} lines via RCON.")
                 return lines
                 
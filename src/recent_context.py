@@ -219,12 +219,13 @@ class RecentContextManager:
             self.logger.debug(f"Conversation item {i+1}: {tokens} tokens, preview: {response[:100]}{'...' if len(response) > 100 else ''}")
             
             if conversation_token_count + tokens <= conversation_tokens:
-                conversation_summaries.insert(0, response)  # Keep chronological order
+                conversation_summaries.append(response)
                 conversation_token_count += tokens
                 self.logger.debug(f"Added conversation item {i+1} to context (total: {conversation_token_count} tokens)")
             else:
                 self.logger.debug(f"Skipped conversation item {i+1} - would exceed token limit")
                 break
+        conversation_summaries.reverse()  # Keep chronological order
         
         # Get additional historical context with remaining tokens - use appropriate method
         self.logger.debug(f"Getting historical summaries with {historical_tokens} token limit")
@@ -0,0 +1,94 @@
+"""Test credential manager encrypted fallback storage."""
+import json
+import stat
+import sys
+import pytest
+from src.credential_manager import CredentialManager
+
+pytest.importorskip("cryptography")
+from cryptography.fernet import Fernet, InvalidToken
+
+@pytest.fixture
+def fallback_manager(tmp_path, monkeypatch):
+    """Create a credential manager whose fallback files live in tmp_path."""
+    monkeypatch.setattr(CredentialManager, "FALLBACK_DIR", tmp_path)
+    monkeypatch.setattr(CredentialManager, "FALLBACK_FILE", tmp_path / "credentials.enc")
+    monkeypatch.setattr(CredentialManager, "SALT_FILE", tmp_path / "salt.bin")
+    CredentialManager.clear_cache()
+    yield CredentialManager()
+    CredentialManager.clear_cache()
+
+def test_legacy_pbkdf2_file_is_read_and_reencrypted(fallback_manager):
+    """Test that a pre-scrypt file is readable and upgraded on the next write."""
+    legacy_fernet = Fernet(CredentialManager._generate_legacy_fallback_key("pw"))
+    CredentialManager.FALLBACK_FILE.write_bytes(legacy_fernet.encrypt(json.dumps({"old": "1"}).encode()))
+    
+    assert fallback_manager._load_fallback_credentials("pw") == {"old": "1"}
+    
+    fallback_manager._store_credential_fallback("new", "2", "pw")
+    encrypted = CredentialManager.FALLBACK_FILE.read_bytes()
+    with pytest.raises(InvalidToken):
+        legacy_fernet.decrypt(encrypted)
+    assert json.loads(fallback_manager._get_fernet("pw").decrypt(encrypted)) == {"old": "1", "new": "2"}
+
+def test_wrong_password_leaves_file_untouched(fallback_manager):
+    """Test that a write with the wrong password raises instead of overwriting the file."""
+    fallback_manager._store_credential_fallback("key", "value", "pw")
+    before = CredentialManager.FALLBACK_FILE.read_bytes()
+    
+    with pytest.raises(InvalidToken):
+        fallback_manager._store_credential_fallback("other", "value", "wrong")
+    
+    assert CredentialManager.FALLBACK_FILE.read_bytes() == before
+    assert fallback_manager._load_fallback_credentials("pw") == {"key": "value"}
+
+def test_fallback_session_writes_once(fallback_manager, monkeypatch):
+    """Test that credentials stored inside a session are written in one rewrite."""
+    rewrites = []
+    rewrite = fallback_manager._rewrite_fallback
+    monkeypatch.setattr(fallback_manager, "_rewrite_fallback",
+                        lambda mutate, password: rewrites.append(1) or rewrite(mutate, password))
+    
+    with fallback_manager.fallback_session("pw"):
+        for i in range(3):
+            fallback_manager._store_credential_fallback(f"key{i}", str(i), "pw")
+        assert not CredentialManager.FALLBACK_FILE.exists()
+    
+    assert len(rewrites) == 1
+    assert fallback_manager._load_fallback_credentials("pw") == {"key0": "0", "key1": "1", "key2": "2"}
+
+@pytest.mark.skipif(sys.platform == "win32", reason="POSIX file modes")
+def test_fallback_file_is_owner_only(fallback_manager):
+    """Test that the credentials file is created with mode 0600."""
+    fallback_manager._store_credential_fallback("key", "value", "pw")
+    assert stat.S_IMODE(CredentialManager.FALLBACK_FILE.stat().st_mode) == 0o600
+
+def test_validate_fallback_does_not_touch_real_file(fallback_manager):
+    """Test that fallback validation runs against a throwaway file."""
+    fallback_manager._store_credential_fallback("key", "value", "pw")
+    before = CredentialManager.FALLBACK_FILE.read_bytes()
+    
+    results = fallback_manager._validate_fallback()
+    
+    assert results == {"fallback_available": True, "fallback_read_write": True}
+    assert CredentialManager.FALLBACK_FILE.read_bytes() == before
+
+def test_validate_fallback_leaves_shared_key_caches_alone(fallback_manager):
+    """Test that the validation probe's one-off key isn't kept in process-wide caches."""
+    fallback_manager._store_credential_fallback("key", "value", "pw")
+    cached = (dict(CredentialManager._derived_keys), dict(CredentialManager._fernets))
+    
+    for _ in range(3):
+        fallback_manager._validate_fallback()
+    
+    assert (CredentialManager._derived_keys, CredentialManager._fernets) == cached
+
+def test_derived_key_caches_are_bounded(fallback_manager):
+    """Test that derived fallback keys and their Fernets are evicted oldest-first."""
+    passwords = [f"pw{i}" for i in range(CredentialManager.FALLBACK_KEY_CACHE_SIZE + 2)]
+    for password in passwords:
+        fallback_manager._get_fernet(password)
+    
+    assert len(CredentialManager._derived_keys) == CredentialManager.FALLBACK_KEY_CACHE_SIZE
+    assert len(CredentialManager._fernets) == CredentialManager.FALLBACK_KEY_CACHE_SIZE
+
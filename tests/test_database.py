@@ -50,3 +50,86 @@ def test_token_limit_enforcement(db_manager):
     # Set a very low token limit to test enforcement
     retrieved = db_manager.get_summaries_up_to_token_limit(10)
     assert len(retrieved) < len(summaries)
+
+@pytest.fixture
+def server_db(tmp_path):
+    """Create a temporary database with a single server table."""
+    db_path = tmp_path / "test_servers.sqlite"
+    return DatabaseManager(str(db_path), {"Test Server": "summaries_test_server"})
+
+def test_token_limit_keeps_most_recent_in_order(server_db):
+    """Test that the token budget keeps the newest summaries in chronological order."""
+    summaries = ["oldest summary text", "middle summary text", "newest summary text"]
+    for summary in summaries:
+        server_db.save_summary("Test Server", summary)
+    
+    limit = sum(DatabaseManager.count_tokens(s) for s in summaries[1:])
+    assert server_db.get_summaries_up_to_token_limit("Test Server", limit) == summaries[1:]
+    assert server_db.get_summaries_up_to_token_limit("Test Server", 0) == []
+
+def test_legacy_rows_get_token_counts(tmp_path):
+    """Test that rows written before token_count existed are backfilled."""
+    db_path = str(tmp_path / "legacy.sqlite")
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("""
+            CREATE TABLE summaries_legacy (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                summary BLOB
+            )
+        """)
+        conn.execute("INSERT INTO summaries_legacy (summary) VALUES (?)",
+                     (zlib.compress("Legacy summary".encode("utf-8")),))
+    
+    db = DatabaseManager(db_path, {"Legacy": "summaries_legacy"})
+    
+    with sqlite3.connect(db_path) as conn:
+        token_count = conn.execute("SELECT token_count FROM summaries_legacy").fetchone()[0]
+    assert token_count == DatabaseManager.count_tokens("Legacy summary")
+    assert db.get_summaries_up_to_token_limit("Legacy", 1000) == ["Legacy summary"]
+
+def test_cluster_token_limit_is_per_cluster(server_db):
+    """Test that cluster summaries are budgeted per cluster, newest first."""
+    server_db.save_cluster_summary("Alpha", "alpha old summary")
+    server_db.save_cluster_summary("Beta", "beta summary")
+    server_db.save_cluster_summary("Alpha", "alpha new summary")
+    
+    limit = DatabaseManager.count_tokens("alpha new summary")
+    assert server_db.get_cluster_summaries_up_to_token_limit("Alpha", limit) == ["alpha new summary"]
+    assert server_db.get_cluster_summaries_up_to_token_limit("Alpha", 1000) == [
+        "alpha old summary", "alpha new summary"
+    ]
+
+def test_zlib_and_zstd_blobs_both_decompress():
+    """Test that blob format is detected so older zlib rows stay readable."""
+    zstandard = pytest.importorskip("zstandard")
+    text = "Summary stored before and after the switch"
+    assert DatabaseManager._decompress_text(zlib.compress(text.encode("utf-8"))) == text
+    assert DatabaseManager._decompress_text(zstandard.compress(text.encode("utf-8"))) == text
+    assert DatabaseManager._decompress_text(DatabaseManager._compress_text(text)) == text
+
+def test_save_summaries_batch(server_db):
+    """Test that a batch insert keeps order and records token counts."""
+    summaries = ["first batched summary", "second batched summary"]
+    server_db.save_summaries("Test Server", summaries)
+    server_db.save_summaries("Test Server", [])
+    
+    assert server_db.get_summaries_up_to_token_limit("Test Server", 1000) == summaries
+
+def test_summary_with_special_token_text_is_saved(server_db):
+    """Test that model output containing special-token strings is still stored."""
+    summary = "The tribe said <|endoftext|> and logged off."
+    server_db.save_summary("Test Server", summary)
+    server_db.save_cluster_summary("Test Cluster", summary)
+    
+    assert server_db.get_summaries_up_to_token_limit("Test Server", 1000) == [summary]
+    assert server_db.get_cluster_summaries_up_to_token_limit("Test Cluster", 1000) == [summary]
+
+def test_context_manager_closes_connection(tmp_path):
+    """Test that leaving a with-block closes the shared connection."""
+    with DatabaseManager(str(tmp_path / "ctx.sqlite"), {}) as db:
+        db.log_ip_change("203.0.113.1", "203.0.113.2")
+        assert db.get_ip_history(1)
+    
+    with pytest.raises(sqlite3.ProgrammingError):
+        db.get_ip_history(1)
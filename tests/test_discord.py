@@ -1,7 +1,7 @@
 """Test Discord manager module."""
 import pytest
-from unittest.mock import MagicMock, patch
-from src.discord_manager import DiscordManager
+from unittest.mock import AsyncMock, MagicMock, patch
+from src.discord_manager import DiscordManager, _TokenBucket
 
 @pytest.fixture
 def discord_manager():
@@ -28,6 +28,28 @@ def test_split_text_on_word_boundaries():
     # Check that we split on spaces
     assert all(not chunk.endswith(" ") for chunk in result[:-1])
 
+def test_split_text_prefers_paragraph_breaks():
+    """Test that paragraph breaks are preferred over word boundaries."""
+    text = "first paragraph here\n\n" + "second paragraph words " * 3
+    result = DiscordManager.split_text_on_word_boundaries(text, max_length=40)
+    assert result[0] == "first paragraph here"
+    assert all(len(chunk) <= 40 for chunk in result)
+
+def test_split_text_without_whitespace():
+    """Test that text without break points is hard-split at the limit."""
+    text = "x" * 4500
+    result = DiscordManager.split_text_on_word_boundaries(text)
+    assert [len(chunk) for chunk in result] == [2000, 2000, 500]
+    assert "".join(result) == text
+
+def test_split_text_long_message_keeps_all_words():
+    """Test that a ~100 KB message splits into full chunks without losing text."""
+    text = "\n\n".join("Paragraph %d. " % i + "word " * 60 for i in range(320))
+    result = DiscordManager.split_text_on_word_boundaries(text)
+    assert len(text) > 100_000
+    assert all(0 < len(chunk) <= 2000 for chunk in result)
+    assert " ".join(result).split() == text.split()
+
 @pytest.mark.asyncio
 async def test_send_message(discord_manager):
     """Test sending messages to Discord."""
@@ -36,14 +58,57 @@ async def test_send_message(discord_manager):
     
     # Mock the channel and client
     mock_channel = MagicMock()
-    discord_manager.client.fetch_channel = MagicMock(return_value=mock_channel)
+    mock_channel.send = AsyncMock()
+    discord_manager.client.get_channel = MagicMock(return_value=None)
+    discord_manager.client.fetch_channel = AsyncMock(return_value=mock_channel)
     
     # Send message
-    await discord_manager.send_message(message, channel_id)
+    assert await discord_manager.send_message(message, channel_id) is True
     
-    # Verify calls
-    discord_manager.client.fetch_channel.assert_called_once_with(channel_id)
-    mock_channel.send.assert_called_once_with(message)
+    # Cold cache falls back to a REST lookup
+    discord_manager.client.get_channel.assert_called_once_with(channel_id)
+    discord_manager.client.fetch_channel.assert_awaited_once_with(channel_id)
+    mock_channel.send.assert_awaited_once_with(message)
+
+def test_rate_limit_delay_only_when_bucket_empty():
+    """Test that pacing only kicks in once the rate limit bucket is exhausted."""
+    assert DiscordManager._rate_limit_delay({"X-RateLimit-Remaining": "4"}) == 0.0
+    assert DiscordManager._rate_limit_delay({}) == 0.0
+    assert DiscordManager._rate_limit_delay(
+        {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset-After": "1.25"}
+    ) == 1.25
+
+def test_token_bucket_paces_bursts():
+    """Test that the send bucket allows a full burst and then spaces out sends."""
+    bucket = _TokenBucket(5, 5.0)
+    assert [bucket.reserve() for _ in range(5)] == [0.0] * 5
+    first_wait = bucket.reserve()
+    second_wait = bucket.reserve()
+    assert 0.9 < first_wait <= 1.0
+    assert 1.9 < second_wait <= 2.0
+
+@pytest.mark.asyncio
+async def test_post_chunk_retries_after_429(discord_manager):
+    """Test that a 429 response is waited out and the chunk is resent."""
+    def response(status, headers):
+        resp = MagicMock(status=status, headers=headers)
+        resp.text = AsyncMock(return_value="")
+        resp.read = AsyncMock(return_value=b"")
+        context = MagicMock()
+        context.__aenter__ = AsyncMock(return_value=resp)
+        context.__aexit__ = AsyncMock(return_value=False)
+        return context
+    
+    session = MagicMock()
+    session.post.side_effect = [response(429, {"Retry-After": "0.25"}), response(200, {})]
+    
+    with patch("src.discord_manager.asyncio.sleep", new=AsyncMock()) as sleep:
+        status, _, delay = await discord_manager._post_chunk(session, "url", b'{"content":"hi"}')
+    
+    assert status == 200
+    assert delay == 0.0
+    assert session.post.call_count == 2
+    sleep.assert_awaited_once_with(0.25)
 
 @pytest.mark.asyncio
 async def test_send_long_message(discord_manager):
@@ -53,10 +118,15 @@ async def test_send_long_message(discord_manager):
     
     # Mock the channel and client
     mock_channel = MagicMock()
-    discord_manager.client.fetch_channel = MagicMock(return_value=mock_channel)
+    mock_channel.send = AsyncMock()
+    discord_manager.client.get_channel = MagicMock(return_value=mock_channel)
+    discord_manager.client.fetch_channel = AsyncMock()
     
     # Send message
-    await discord_manager.send_message(message, channel_id)
+    assert await discord_manager.send_message(message, channel_id) is True
+    
+    # Cached channel is used without a REST lookup
+    discord_manager.client.fetch_channel.assert_not_awaited()
     
     # Verify multiple sends occurred
-    assert mock_channel.send.call_count > 1
+    assert mock_channel.send.await_count > 1
@@ -0,0 +1,186 @@
+"""Test IP monitor manager module."""
+import asyncio
+import json
+import os
+import stat
+import sys
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from src.ip_monitor_manager import IPMonitorManager, _IP_SERVICES
+
+IPIFY, HTTPBIN, JSONIP = _IP_SERVICES
+
+def fake_session(answers, cancelled):
+    """Build an aiohttp.ClientSession stand-in answering each URL after a delay.
+    
+    Args:
+        answers: Mapping of URL to (delay in seconds, JSON payload or exception)
+        cancelled: List that collects the URLs whose requests were cancelled
+    """
+    class FakeResponse:
+        status = 200
+        
+        def __init__(self, payload):
+            self._payload = payload
+        
+        async def json(self, content_type=None):
+            return self._payload
+    
+    class FakeRequest:
+        def __init__(self, url):
+            self.url = url
+        
+        async def __aenter__(self):
+            delay, payload = answers[self.url]
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                cancelled.append(self.url)
+                raise
+            if isinstance(payload, Exception):
+                raise payload
+            return FakeResponse(payload)
+        
+        async def __aexit__(self, *exc_info):
+            return False
+    
+    class FakeSession:
+        def __init__(self, **kwargs):
+            pass
+        
+        async def __aenter__(self):
+            return self
+        
+        async def __aexit__(self, *exc_info):
+            return False
+        
+        def get(self, url):
+            return FakeRequest(url)
+    
+    return FakeSession
+
+async def check_ip(config, answers):
+    """Run check_current_ip against fake lookup services, returning (ip, cancelled URLs)."""
+    cancelled = []
+    with patch("src.ip_monitor_manager.aiohttp.ClientSession", fake_session(answers, cancelled)):
+        ip = await IPMonitorManager(config, None, None).check_current_ip()
+    return ip, cancelled
+
+@pytest.mark.asyncio
+async def test_check_ip_takes_first_answer_without_waiting_for_slow_service():
+    """Test that a fast answer wins and a hanging service is cancelled, not waited out."""
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    ip, cancelled = await check_ip({}, {
+        IPIFY: (10, {"ip": "203.0.113.1"}),
+        HTTPBIN: (0.05, {"origin": "203.0.113.2"}),
+        JSONIP: (10, {"ip": "203.0.113.3"}),
+    })
+    assert ip == "203.0.113.2"
+    assert loop.time() - started < 1
+    assert sorted(cancelled) == sorted([IPIFY, JSONIP])
+
+@pytest.mark.asyncio
+async def test_check_ip_falls_back_and_cancels_remaining_lookups():
+    """Test that a failed service is skipped and slower lookups are cancelled."""
+    ip, cancelled = await check_ip({}, {
+        IPIFY: (0, RuntimeError("unreachable")),
+        HTTPBIN: (0, {"origin": "203.0.113.2"}),
+        JSONIP: (10, {"ip": "203.0.113.3"}),
+    })
+    assert ip == "203.0.113.2"
+    assert cancelled == [JSONIP]
+
+@pytest.mark.asyncio
+async def test_check_ip_keeps_last_known_address_family():
+    """Test that an IPv6 answer doesn't replace a known IPv4 address while IPv4 is reachable."""
+    config = {"ip_monitor": {"last_known_ip": "203.0.113.1"}}
+    ip, _ = await check_ip(config, {
+        IPIFY: (0, RuntimeError("unreachable")),
+        HTTPBIN: (0, {"origin": "2001:db8::1"}),
+        JSONIP: (0, {"ip": "203.0.113.9"}),
+    })
+    assert ip == "203.0.113.9"
+    
+    # Only the other family answering is a real change
+    ip, _ = await check_ip(config, {
+        IPIFY: (0, RuntimeError("unreachable")),
+        HTTPBIN: (0, {"origin": "not an address"}),
+        JSONIP: (0, {"ip": "2001:db8::1"}),
+    })
+    assert ip == "2001:db8::1"
+
+@pytest.fixture
+def file_manager(tmp_path):
+    """Create an IP monitor manager backed by a config file in tmp_path."""
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps({"ip_monitor": {"last_known_ip": "203.0.113.1"}}, indent=4))
+    config_manager = MagicMock(spec=["_get_config_path"])
+    config_manager._get_config_path.return_value = str(config_path)
+    database = MagicMock()
+    return IPMonitorManager(config_manager, database, None), config_path
+
+def test_config_file_is_parsed_once_until_it_changes(file_manager):
+    """Test that the parsed config is reused until the file's mtime or size changes."""
+    manager, config_path = file_manager
+    first = manager.get_config()
+    assert manager.get_config() is first
+    
+    config_path.write_text(json.dumps({"ip_monitor": {"last_known_ip": "198.51.100.7"}}))
+    os.utime(config_path, ns=(0, os.stat(config_path).st_mtime_ns + 1_000_000_000))
+    assert manager.get_last_known_ip() == "198.51.100.7"
+
+def test_save_config_refreshes_cache_and_file(file_manager):
+    """Test that an update is written to disk and served from the cache afterwards."""
+    manager, config_path = file_manager
+    assert manager.update_last_known_ip("198.51.100.7", "auto") is True
+    manager.database.log_ip_change.assert_called_once_with("203.0.113.1", "198.51.100.7", "auto")
+    
+    assert json.loads(config_path.read_text()) == {"ip_monitor": {"last_known_ip": "198.51.100.7"}}
+    cached = manager.get_config()
+    assert manager.get_config() is cached
+    assert cached["ip_monitor"]["last_known_ip"] == "198.51.100.7"
+    assert [p.name for p in config_path.parent.iterdir()] == ["config.json"]
+
+@pytest.mark.skipif(sys.platform == "win32", reason="POSIX file modes")
+def test_save_config_keeps_file_mode(file_manager):
+    """Test that the atomic save doesn't loosen the config file's permissions."""
+    manager, config_path = file_manager
+    os.chmod(config_path, 0o600)
+    manager.save_config({"discord": {"token": "secret"}})
+    assert stat.S_IMODE(config_path.stat().st_mode) == 0o600
+
+NOTIFY_CONFIG = {"discord": {"token": "token", "channel_id_server_status": 42}}
+
+@pytest.mark.asyncio
+async def test_notify_reuses_injected_discord_manager():
+    """Test that an injected HTTP-mode manager is reused and left open for its owner."""
+    discord = MagicMock(use_client=False, token="token")
+    discord.send_message = AsyncMock(return_value=True)
+    discord.aclose = AsyncMock()
+    manager = IPMonitorManager(NOTIFY_CONFIG, None, discord)
+    
+    with patch("src.discord_manager.DiscordManager") as discord_class:
+        assert await manager.notify_discord_ip_change("203.0.113.1", "203.0.113.2") is True
+        assert await manager.notify_discord_ip_change("203.0.113.2", "203.0.113.3") is True
+    
+    discord_class.assert_not_called()
+    assert discord.send_message.await_count == 2
+    discord.aclose.assert_not_awaited()
+
+@pytest.mark.asyncio
+async def test_notify_builds_one_http_manager_when_none_injected():
+    """Test that a fallback manager is built once and its session closed after each send."""
+    manager = IPMonitorManager(NOTIFY_CONFIG, None, None)
+    
+    with patch("src.discord_manager.DiscordManager") as discord_class:
+        http = discord_class.return_value
+        http.token = "token"
+        http.send_message = AsyncMock(return_value=True)
+        http.aclose = AsyncMock()
+        assert await manager.notify_discord_ip_change("203.0.113.1", "203.0.113.2") is True
+        assert await manager.notify_discord_ip_change("203.0.113.2", "203.0.113.3") is True
+    
+    discord_class.assert_called_once_with("token", use_client=False)
+    assert http.send_message.await_count == 2
+    assert http.aclose.await_count == 2
@@ -0,0 +1,18 @@
+"""Test JSON serialisation helpers."""
+import json
+from src import json_utils
+
+def test_dumps_round_trip():
+    """Test that compact and indented output decode to the same object."""
+    data = {"name": "Ragnarök", "ids": [1, 2, 3], "nested": {"ok": True}}
+    assert json_utils.loads(json_utils.dumps(data)) == data
+    assert json_utils.loads(json_utils.dumps(data, indent=True)) == data
+
+def test_dumps_indent_is_two_spaces():
+    """Test that indented output uses two spaces with or without orjson."""
+    assert json_utils.dumps({"a": 1}, indent=True) == b'{\n  "a": 1\n}'
+
+def test_dumps_config_matches_web_app_layout():
+    """Test that config.json is written exactly like the web app's json.dump(indent=4)."""
+    config = {"discord": {"token": "x", "channel_id_global": 1}, "servers": {}}
+    assert json_utils.dumps_config(config).decode("utf-8") == json.dumps(config, indent=4)
@@ -0,0 +1,68 @@
+"""Test Ollama manager helpers."""
+import json
+import pytest
+from unittest.mock import MagicMock, patch
+from src.ollama_manager import OllamaManager, condense_log_lines
+
+def test_condense_log_lines_keeps_unique_lines():
+    """Test that distinct events pass through unchanged and in order."""
+    lines = ["Bob tamed a Raptor", "Alice joined this ARK"]
+    assert condense_log_lines(lines) == lines
+
+def test_condense_log_lines_counts_repeats_across_timestamps():
+    """Test that the same event at different times collapses with a count."""
+    lines = [
+        "2024.01.31_18.05.12: Bob was killed by a Dodo",
+        "2024.01.31_18.07.40: Alice tamed a Rex",
+        "2024.01.31_19.11.02: Bob was killed by a Dodo",
+        "2024.01.31_20.00.00: Bob was killed by a Dodo",
+    ]
+    assert condense_log_lines(lines) == [
+        "2024.01.31_18.05.12: Bob was killed by a Dodo (×3)",
+        "2024.01.31_18.07.40: Alice tamed a Rex",
+    ]
+
+@pytest.fixture
+def streaming_manager():
+    """Create an Ollama manager whose HTTP session returns a canned NDJSON stream."""
+    manager = OllamaManager("http://localhost:11434/api/generate", "test-model", "ollama serve", timeout=60)
+    response = MagicMock(status_code=200)
+    response.__enter__.return_value = response
+    manager.session = MagicMock()
+    manager.session.post.return_value = response
+    return manager, response
+
+def ndjson(*objects):
+    """Encode stream objects the way requests' iter_lines() yields them."""
+    return [json.dumps(obj).encode() for obj in objects]
+
+def test_summary_joins_stream_until_done(streaming_manager):
+    """Test that streamed chunks are joined and nothing after the done object is read."""
+    manager, response = streaming_manager
+    response.iter_lines.return_value = iter(
+        ndjson({"response": "Bob "}, {"response": "met a Dodo"}, {"response": "", "done": True})
+        + [b"", b"not json"]
+    )
+    
+    assert manager.get_funny_summary(["Bob was killed by a Dodo"], "") == "Bob met a Dodo"
+    assert manager.session.post.call_args.kwargs["json"]["stream"] is True
+
+def test_summary_reports_stream_error(streaming_manager):
+    """Test that an error object in the stream becomes an AI error message."""
+    manager, response = streaming_manager
+    response.iter_lines.return_value = iter(ndjson({"response": "Bob "}, {"error": "model not found"}))
+    
+    assert manager.get_funny_summary(["Bob tamed a Raptor"], "") == "[AI Error: model not found]"
+
+def test_summary_stops_at_overall_deadline(streaming_manager):
+    """Test that a stream still producing tokens is cut off once ai.timeout_seconds passes."""
+    manager, response = streaming_manager
+    response.iter_lines.return_value = iter(ndjson(*({"response": "la "} for _ in range(100))))
+    clock = iter([0.0, 30.0, 61.0])
+    
+    with patch("src.ollama_manager.time.monotonic", side_effect=lambda: next(clock)):
+        result = manager.get_funny_summary(["Bob tamed a Raptor"], "")
+    
+    assert result == "[AI Error: Ollama generation exceeded 60s]"
+    response.__exit__.assert_called_once()
+
@@ -16,7 +16,7 @@ import sys
 # Add the parent directory to the Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.config import Config
+from src.config import Config, get_config
 from src.credential_manager import CredentialManager
 from src.server_config import ServerConfig
 
@@ -79,7 +79,7 @@ class ConfigWebApp:
             # If we don't have a config instance yet, create one first
             if not hasattr(self, 'config_manager') or self.config_manager is None:
                 logging.info("Creating new Config instance")
-                self.config_manager = Config()
+                self.config_manager = get_config()
             else:
                 # Reload existing instance
                 logging.info("Reloading existing Config instance")
@@ -87,7 +87,7 @@ class ConfigWebApp:
                 # If reload returns None, create a new instance
                 if self.config_manager is None:
                     logging.info("Reload returned None, creating new instance")
-                    self.config_manager = Config()
+                    self.config_manager = get_config()
             
             config = self.config_manager
             
@@ -1087,24 +1087,23 @@ class ConfigWebApp:
                     return jsonify({'error': 'Configuration not available'}), 500
                 
                 # Create managers
-                database_manager = DatabaseManager(
+                with DatabaseManager(
                     config.db_path,
                     {}  # server_tables - not needed for IP operations
-                )
-                
-                # Create IP monitor (Discord handled via HTTP API)
-                ip_manager = IPMonitorManager(self, database_manager, None)
-                
-                # Perform IP check
-                import asyncio
-                result = asyncio.run(ip_manager.perform_ip_check_and_notify())
-                
-                return jsonify({
-                    'success': True,
-                    'result': result,
-                    'timestamp': datetime.now().isoformat()
-                })
-                
+                ) as database_manager:
+                    # Create IP monitor (Discord handled via HTTP API)
+                    ip_manager = IPMonitorManager(self, database_manager, None)
+                    
+                    # Perform IP check
+                    import asyncio
+                    result = asyncio.run(ip_manager.perform_ip_check_and_notify())
+                    
+                    return jsonify({
+                        'success': True,
+                        'result': result,
+                        'timestamp': datetime.now().isoformat()
+                    })
+                    
             except Exception as e:
                 return jsonify({
                     'success': False,
@@ -1122,21 +1121,20 @@ class ConfigWebApp:
                 if not config:
                     return jsonify({'error': 'Configuration not available'}), 500
                 
-                database_manager = DatabaseManager(
+                with DatabaseManager(
                     config.db_path,
                     {}  # server_tables - not needed for IP operations
-                )
-                
-                limit = request.args.get('limit', 50, type=int)
-                history = database_manager.get_ip_history(limit)
-                
-                return jsonify({
-                    'success': True,
-                    'history': history,
-                    'count': len(history),
-                    'timestamp': datetime.now().isoformat()
-                })
-                
+                ) as database_manager:
+                    limit = request.args.get('limit', 50, type=int)
+                    history = database_manager.get_ip_history(limit)
+                    
+                    return jsonify({
+                        'success': True,
+                        'history': history,
+                        'count': len(history),
+                        'timestamp': datetime.now().isoformat()
+                    })
+                    
             except Exception as e:
                 return jsonify({
                     'success': False,
@@ -1161,24 +1159,23 @@ class ConfigWebApp:
                     return jsonify({'error': 'Configuration not available'}), 500
                 
                 # Create managers
-                database_manager = DatabaseManager(
+                with DatabaseManager(
                     config.db_path,
                     {}
-                )
-                
-                # Create IP monitor (Discord handled via HTTP API)  
-                ip_manager = IPMonitorManager(self, database_manager, None)
-                
-                # Update IP manually
-                success = ip_manager.update_last_known_ip(data['ip_address'], 'manual')
-                
-                return jsonify({
-                    'success': success,
-                    'message': 'IP address updated successfully' if success else 'No change detected',
-                    'new_ip': data['ip_address'],
-                    'timestamp': datetime.now().isoformat()
-                })
-                
+                ) as database_manager:
+                    # Create IP monitor (Discord handled via HTTP API)  
+                    ip_manager = IPMonitorManager(self, database_manager, None)
+                    
+                    # Update IP manually
+                    success = ip_manager.update_last_known_ip(data['ip_address'], 'manual')
+                    
+                    return jsonify({
+                        'success': success,
+                        'message': 'IP address updated successfully' if success else 'No change detected',
+                        'new_ip': data['ip_address'],
+                        'timestamp': datetime.now().isoformat()
+                    })
+                    
             except Exception as e:
                 return jsonify({
                     'success': False,
@@ -1569,30 +1566,29 @@ class ConfigWebApp:
                 return {'error': 'Configuration not available'}
             
             # Create managers
-            database_manager = DatabaseManager(
+            with DatabaseManager(
                 config.db_path,
                 {}
-            )
-            
-            # Create IP monitor (Discord handled via HTTP API)
-            ip_manager = IPMonitorManager(self, database_manager, None)
-            
-            # Get current status
-            import asyncio
-            current_ip = asyncio.run(ip_manager.check_current_ip())
-            last_known = ip_manager.get_last_known_ip()
-            monitor_config = ip_manager.get_monitor_config()
-            recent_history = ip_manager.get_ip_history(5)
-            
-            return {
-                'current_ip': current_ip,
-                'last_known_ip': last_known,
-                'config': monitor_config,
-                'recent_history': recent_history,
-                'is_changed': current_ip != last_known if current_ip else False,
-                'last_check': datetime.now().isoformat()
-            }
-            
+            ) as database_manager:
+                # Create IP monitor (Discord handled via HTTP API)
+                ip_manager = IPMonitorManager(self, database_manager, None)
+                
+                # Get current status
+                import asyncio
+                current_ip = asyncio.run(ip_manager.check_current_ip())
+                last_known = ip_manager.get_last_known_ip()
+                monitor_config = ip_manager.get_monitor_config()
+                recent_history = ip_manager.get_ip_history(5)
+                
+                return {
+                    'current_ip': current_ip,
+                    'last_known_ip': last_known,
+                    'config': monitor_config,
+                    'recent_history': recent_history,
+                    'is_changed': current_ip != last_known if current_ip else False,
+                    'last_check': datetime.now().isoformat()
+                }
+                
         except Exception as e:
             logging.error(f"Error getting IP monitor status: {e}")
             return {'error': str(e)}